@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark del tiempo de importación en frío
+
+Cada medición arranca un intérprete nuevo, importa el módulo indicado y reporta el
+tiempo de importación y si se cargaron librerías pesadas (visualización, skfuzzy).
+La fila de referencia importa las librerías que cargaba antes `import main`.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PESADOS = ['matplotlib', 'seaborn', 'pandas', 'skfuzzy', 'scipy']
+
+CASOS = {
+    'numpy (piso)': 'import numpy',
+    'red_bayesiana.red': 'import red_bayesiana.red',
+    'main': 'import main',
+    'demo_red_difusa': 'import demo_red_difusa',
+    'referencia: librerías de antes': 'import numpy, skfuzzy, seaborn, pandas, matplotlib.pyplot',
+}
+
+_PLANTILLA = """
+import json, sys, time
+inicio = time.perf_counter()
+{sentencia}
+duracion = time.perf_counter() - inicio
+print(json.dumps({{'segundos': duracion, 'cargados': [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+
+def medir_importacion(sentencia, repeticiones=5):
+    """Mediana de los segundos de importación y de proceso completo, y módulos pesados cargados"""
+    codigo = _PLANTILLA.format(sentencia=sentencia, pesados=PESADOS)
+    importacion, proceso, cargados = [], [], []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, check=True,
+                                capture_output=True, text=True, env={**os.environ, 'MPLBACKEND': 'Agg'})
+        proceso.append(time.perf_counter() - inicio)
+        resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+        importacion.append(resultado['segundos'])
+        cargados = resultado['cargados']
+    return {
+        'importacion_s': statistics.median(importacion),
+        'proceso_s': statistics.median(proceso),
+        'pesados_cargados': cargados,
+    }
+
+
+def main():
+    print("🚀 Tiempo de importación en frío (mediana de 5 procesos):")
+    print(f"   {'Módulo':<32} | {'Import':>8} | {'Proceso':>8} | Pesados cargados")
+    print("   " + "-" * 80)
+    for nombre, sentencia in CASOS.items():
+        try:
+            resultado = medir_importacion(sentencia)
+        except subprocess.CalledProcessError as e:
+            print(f"   {nombre:<32} | no disponible ({e.stderr.strip().splitlines()[-1]})")
+            continue
+        print(f"   {nombre:<32} | {resultado['importacion_s'] * 1000:6.1f}ms | "
+              f"{resultado['proceso_s'] * 1000:6.1f}ms | {', '.join(resultado['pesados_cargados']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la evaluación paralela por procesos
+
+Genera un registro sintético de 100k filas dentro de los rangos de PARAMETROS y mide
+el rendimiento de `ParallelEvaluator` con 1, 2, 4, ... procesos (hasta el número de
+núcleos) frente a la evaluación serial en el proceso principal. El arranque del pool
+(carga de la red en cada trabajador) se excluye con una evaluación de calentamiento.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import PARAMETROS
+from red_bayesiana.paralelo import ParallelEvaluator
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+
+
+def registro_sintetico(filas, semilla=0):
+    """Matriz (filas, 8) uniforme dentro de los rangos de cada variable de entrada"""
+    variables = TrueFuzzyBayesianNetwork.shared().input_variables
+    rng = np.random.default_rng(semilla)
+    minimos = np.array([PARAMETROS[var]['min'] for var in variables], dtype=np.float64)
+    maximos = np.array([PARAMETROS[var]['max'] for var in variables], dtype=np.float64)
+    return minimos + rng.random((filas, len(variables))) * (maximos - minimos)
+
+
+def _mejor_tiempo(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filas', type=int, default=100_000)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--sin-precalculo', action='store_true',
+                        help='Usar la inferencia por tensores en vez de la tabla precalculada')
+    args = parser.parse_args()
+
+    precompute = not args.sin_precalculo
+    evidencia = registro_sintetico(args.filas)
+    red = TrueFuzzyBayesianNetwork.shared(precompute=precompute)
+    _, esperado = red.fuzzy_inference_batch(evidencia)
+    serial = _mejor_tiempo(lambda: red.fuzzy_inference_batch(evidencia), args.repeticiones)
+
+    nucleos = os.cpu_count() or 1
+    procesos = sorted({2 ** k for k in range(nucleos.bit_length()) if 2 ** k <= nucleos} | {nucleos})
+
+    print(f"🚀 Evaluación paralela: {args.filas} filas, bloques de {args.chunk_size}, "
+          f"{nucleos} núcleos, {'tabla precalculada' if precompute else 'tensores'}")
+    print(f"   {'Procesos':<10} | {'Tiempo':>9} | {'Filas/s':>12} | {'Aceleración':>11} | Igual al serial")
+    print("   " + "-" * 68)
+    print(f"   {'serial':<10} | {serial * 1000:7.1f}ms | {args.filas / serial:12,.0f} | {1.0:10.2f}x | -")
+    for trabajadores in procesos:
+        with ParallelEvaluator(trabajadores, args.chunk_size, precompute) as evaluador:
+            _, obtenido = evaluador.evaluate(evidencia, return_distributions=False)  # calentamiento
+            tiempo = _mejor_tiempo(lambda: evaluador.evaluate(evidencia, return_distributions=False),
+                                   args.repeticiones)
+        print(f"   {trabajadores:<10} | {tiempo * 1000:7.1f}ms | {args.filas / tiempo:12,.0f} | "
+              f"{serial / tiempo:10.2f}x | {np.array_equal(obtenido, esperado)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark y verificación del registro de distritos
+
+Para cada nodo objetivo de la red (y un nodo 'lahar' añadido bajo 'riesgo', de modo
+que haya dos niveles de nodos intermedios) compara `DistrictRegistry.evaluate` con
+`fuzzy_inference` distrito por distrito sobre lecturas aleatorias de las variables
+dinámicas, y mide el tiempo de ambas rutas. Termina con código 1 si algún objetivo
+no coincide.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import DISTRITOS, PARAMETROS
+from red_bayesiana.nodo import FuzzyBayesianNode
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+from red_bayesiana.registro import DistrictRegistry
+from red_bayesiana.triangular import TriangularFuzzyProbability
+
+
+def red_con_lahar():
+    """Red del Misti con un nodo 'lahar' hijo de 'riesgo' y 'proximidad'"""
+    red = TrueFuzzyBayesianNetwork(cache_size=0)
+    lahar = FuzzyBayesianNode('lahar', ['baja', 'alta'], ['riesgo', 'proximidad'])
+    reglas = {}
+    for i, riesgo in enumerate(red.nodes['riesgo'].states):
+        for j, proximidad in enumerate(red.nodes['proximidad'].states):
+            alta = (i + j + 1) / 6
+            reglas[(riesgo, proximidad)] = {
+                'baja': TriangularFuzzyProbability(max(0.9 - alta - 0.1, 0.0), 0.9 - alta, min(1.0 - alta, 1.0)),
+                'alta': TriangularFuzzyProbability(max(alta - 0.1, 0.0), alta, min(alta + 0.1, 1.0)),
+            }
+    lahar.set_fuzzy_cpd(reglas)
+    red.add_node(lahar)
+    return red
+
+
+def lecturas_aleatorias(variables, filas, semilla=0):
+    """Diccionario variable dinámica -> arreglo (filas,) uniforme dentro de PARAMETROS"""
+    rng = np.random.default_rng(semilla)
+    return {var: PARAMETROS[var]['min'] + rng.random(filas) * (PARAMETROS[var]['max'] - PARAMETROS[var]['min'])
+            for var in variables}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lecturas', type=int, default=200)
+    args = parser.parse_args()
+
+    red = red_con_lahar()
+    limites = {var: (info['min'], info['max']) for var, info in PARAMETROS.items()}
+    objetivos = [nombre for nombre, nodo in red.nodes.items() if nodo.parents]
+
+    print(f"🏘️  Registro de distritos: {len(DISTRITOS)} distritos x {args.lecturas} lecturas")
+    print(f"   {'Objetivo':<16} | {'Registro':>10} | {'fuzzy_inference':>15} | Igual a fuzzy_inference")
+    print("   " + "-" * 72)
+    distintos = []
+    for objetivo in objetivos:
+        registro = DistrictRegistry(red, target_variable=objetivo, bounds=limites)
+        registro.register_many(DISTRITOS)
+        lecturas = lecturas_aleatorias(registro.dynamic_variables, args.lecturas)
+
+        registro.evaluate(lecturas)  # calentamiento: fuzzificación y plan de ejecución
+        inicio = time.perf_counter()
+        distribuciones, crisp = registro.evaluate(lecturas)
+        tiempo_registro = time.perf_counter() - inicio
+
+        # Un objetivo que no depende de la lectura no tiene eje de lecturas
+        estados = red.nodes[objetivo].states
+        distribuciones = np.broadcast_to(distribuciones, (args.lecturas, len(registro.names), len(estados), 3))
+        crisp = np.broadcast_to(crisp, (args.lecturas, len(registro.names)))
+        esperadas = np.empty_like(distribuciones)
+        esperado = np.empty_like(crisp)
+        inicio = time.perf_counter()
+        for r in range(args.lecturas):
+            for d, nombre in enumerate(registro.names):
+                evidencia = {var: float(registro._clip(var, valor))
+                             for var, valor in DISTRITOS[nombre].items() if var in PARAMETROS}
+                evidencia.update({var: float(lecturas[var][r]) for var in registro.dynamic_variables})
+                distribucion = red.fuzzy_inference(evidencia, objetivo)
+                esperadas[r, d] = [[distribucion[estado].a, distribucion[estado].m, distribucion[estado].b]
+                                   for estado in estados]
+                esperado[r, d] = red.defuzzify_distribution(distribucion)
+        tiempo_escalar = time.perf_counter() - inicio
+
+        igual = np.array_equal(distribuciones, esperadas) and np.array_equal(crisp, esperado)
+        if not igual:
+            distintos.append(objetivo)
+        print(f"   {objetivo:<16} | {tiempo_registro * 1000:8.2f}ms | {tiempo_escalar * 1000:13.1f}ms | {igual}")
+
+    print(f"\n{'⚠️ Difieren: ' + ', '.join(distintos) if distintos else '✅ El registro coincide en todos los objetivos'}")
+    return 1 if distintos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de las rutas calientes con umbrales de regresión
+
+Uso:
+    python benchmarks/bench_suite.py ejecutar --salida base.json
+    python benchmarks/bench_suite.py comparar base.json nuevo.json --umbral 0.10
+
+Cada caso se mide con semillas fijas sobre conjuntos sintéticos de 1, 1k y 1M filas
+(las funciones escalares, que recorren las filas en Python, solo hasta 1k salvo con
+--completo). El resultado es un JSON con el mejor tiempo por llamada y por fila de
+cada caso; `comparar` marca los casos cuyo tiempo empeora más que el umbral y
+termina con código 1 si hay alguno.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as aplicacion
+from red_bayesiana.contraccion import ContractionCache
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+from red_bayesiana.sensibilidad import variable_segments
+from red_bayesiana.triangular import TriangularFuzzyArray
+
+SEMILLA = 20240601
+TAMANOS = (1, 1_000, 1_000_000)
+TAMANO_MAXIMO_ESCALAR = 1_000
+
+
+def medir(funcion, repeticiones=5, tiempo_minimo=0.2):
+    """Mejor tiempo por llamada en segundos (autorange de timeit y mínimo de las repeticiones)"""
+    temporizador = timeit.Timer(funcion)
+    numero, tiempo = temporizador.autorange()
+    if tiempo >= tiempo_minimo * 10:
+        return tiempo / numero
+    return min(temporizador.repeat(repeat=repeticiones, number=numero)) / numero
+
+
+def _valores_por_codigo(red, variable):
+    """Valor crisp representativo (centro del segmento) de cada código de estado"""
+    bordes, codigos = variable_segments(red, variable)
+    return {int(codigo): (bordes[i] + bordes[i + 1]) / 2 for i, codigo in enumerate(codigos)}
+
+
+def evidencia_sintetica(red, filas, exacta, semilla=SEMILLA):
+    """
+    Matriz (filas, 8) cuyas claves de 'amenaza' y 'vulnerabilidad' tienen regla exacta
+    (`exacta=True`) o ninguna de las dos la tiene (se interpolan)
+    """
+    rng = np.random.default_rng(semilla)
+    columnas = {}
+    for nodo in ('amenaza', 'vulnerabilidad'):
+        compilado = red.compiled_node(nodo)
+        coincide = compilado.cpd_similarity == len(compilado.parents)
+        candidatos = np.argwhere(coincide if exacta else ~coincide)
+        elegidos = candidatos[rng.integers(0, len(candidatos), size=filas)]
+        for j, padre in enumerate(compilado.parents):
+            valores = _valores_por_codigo(red, padre)
+            columnas[padre] = np.array([valores[codigo] for codigo in elegidos[:, j].tolist()])
+    return np.stack([columnas[var] for var in red.input_variables], axis=1)
+
+
+def casos(tamanos, completo):
+    """Generador de (nombre, filas, función a medir)"""
+    red = TrueFuzzyBayesianNetwork()
+    red_sin_cache = TrueFuzzyBayesianNetwork(cache_size=0)
+    red_compartida = TrueFuzzyBayesianNetwork.shared()
+    variables = red.input_variables
+    escalar = lambda filas: completo or filas <= TAMANO_MAXIMO_ESCALAR
+
+    yield 'construccion_red', 1, lambda: TrueFuzzyBayesianNetwork()
+    yield 'construccion_red_compartida', 1, lambda: TrueFuzzyBayesianNetwork.shared()
+
+    for filas in tamanos:
+        exacta = evidencia_sintetica(red, filas, exacta=True)
+        interpolada = evidencia_sintetica(red, filas, exacta=False, semilla=SEMILLA + 1)
+        dicts_exactos = [dict(zip(variables, fila)) for fila in exacta.tolist()] if escalar(filas) else None
+        dicts_interpolados = [dict(zip(variables, fila)) for fila in interpolada.tolist()] if escalar(filas) else None
+
+        # Fuzzificación
+        if escalar(filas):
+            yield 'crisp_to_fuzzy_state', filas, lambda: [red.crisp_to_fuzzy_state(var, valor)
+                                                          for evidencia in dicts_exactos
+                                                          for var, valor in evidencia.items()]
+        yield 'fuzzifier_codes', filas, lambda: [red.fuzzifier(var).codes(exacta[:, j])
+                                                 for j, var in enumerate(variables)]
+
+        # Inferencia escalar por reglas exactas e interpoladas (sin caché y con caché)
+        if escalar(filas):
+            for ruta, evidencias in (('exacta', dicts_exactos), ('interpolada', dicts_interpolados)):
+                yield f'fuzzy_inference_{ruta}', filas, lambda evidencias=evidencias: [
+                    red_sin_cache.fuzzy_inference(evidencia) for evidencia in evidencias]
+                yield f'fuzzy_inference_{ruta}_cache', filas, lambda evidencias=evidencias: [
+                    red.fuzzy_inference(evidencia) for evidencia in evidencias]
+
+        # Inferencia por lotes
+        for ruta, matriz in (('exacta', exacta), ('interpolada', interpolada)):
+            yield f'fuzzy_inference_batch_{ruta}', filas, lambda matriz=matriz: red_sin_cache.fuzzy_inference_batch(matriz)
+            yield f'fuzzy_inference_batch_{ruta}_tabla', filas, lambda matriz=matriz: red_compartida.fuzzy_inference_batch(matriz)
+
+        # Interpolación de CPDs para claves sin regla
+        compilado = red.compiled_node('amenaza')
+        claves = [tuple(red.nodes[padre].states[codigo] for padre, codigo in zip(compilado.parents, indice))
+                  for indice in np.argwhere(compilado.cpd_similarity < len(compilado.parents)).tolist()]
+        claves = [claves[i % len(claves)] for i in range(filas)] if escalar(filas) else None
+        if escalar(filas):
+            yield '_interpolate_fuzzy_cpd', filas, lambda: [red._interpolate_fuzzy_cpd('amenaza', clave)
+                                                            for clave in claves]
+            yield '_closest_fuzzy_rule', filas, lambda: [red._closest_fuzzy_rule('amenaza', clave)
+                                                         for clave in claves]
+
+        # Defuzzificación
+        distribuciones, _ = red_compartida.fuzzy_inference_batch(interpolada)
+        if escalar(filas):
+            estados = red.nodes['riesgo'].states
+            escalares = [dict(zip(estados, TriangularFuzzyArray.from_stacked(distribucion).to_scalars()))
+                         for distribucion in distribuciones]
+            yield 'defuzzify_distribution', filas, lambda: [red.defuzzify_distribution(distribucion)
+                                                            for distribucion in escalares]
+        yield '_defuzzify_batch', filas, lambda: red._defuzzify_batch('riesgo', distribuciones)
+
+        # Aritmética de números difusos
+        rng = np.random.default_rng(SEMILLA + 2)
+        valores = np.sort(rng.random((filas, 2, 3)), axis=-1)
+        x, y = TriangularFuzzyArray.from_stacked(valores[:, 0]), TriangularFuzzyArray.from_stacked(valores[:, 1])
+        if escalar(filas):
+            pares = list(zip(x.to_scalars(), y.to_scalars()))
+            yield 'tfp_suma', filas, lambda: [a + b for a, b in pares]
+            yield 'tfp_producto', filas, lambda: [a * b for a, b in pares]
+            yield 'tfp_escalar', filas, lambda: [a * 0.5 for a, _ in pares]
+            yield 'tfp_normalize', filas, lambda: [a.normalize() for a, _ in pares]
+        yield 'tfa_suma', filas, lambda: x + y
+        yield 'tfa_producto', filas, lambda: x * y
+        yield 'tfa_escalar', filas, lambda: x * 0.5
+
+    # Primera consulta con entradas faltantes: tabla marginal y rutas de einsum desde cero
+    red_faltantes = TrueFuzzyBayesianNetwork(cache_size=0)
+    completa = dict(zip(variables, evidencia_sintetica(red, 1, exacta=True)[0].tolist()))
+    for faltantes in (1, 4, len(variables)):
+        evidencia = {var: float('nan') if j < faltantes else completa[var] for j, var in enumerate(variables)}
+        def primera_consulta(evidencia=evidencia):
+            red_faltantes.marginal_tables = {}
+            red_faltantes.contractions = ContractionCache()
+            return red_faltantes.fuzzy_inference(evidencia)
+        yield f'fuzzy_inference_faltantes_{faltantes}', 1, primera_consulta
+
+    # Flujo completo de main sin salida por pantalla ni gráficos
+    distritos = list(aplicacion.DISTRITOS.values())
+    for cantidad in (1, len(distritos)):
+        def evaluar(cantidad=cantidad):
+            np.random.seed(SEMILLA)
+            with contextlib.redirect_stdout(io.StringIO()):
+                return [aplicacion.evaluar_riesgo_volcanico(distrito) for distrito in distritos[:cantidad]]
+        yield 'main.evaluar_riesgo_volcanico', cantidad, evaluar
+
+
+def ejecutar(tamanos, completo, repeticiones):
+    """Medir todos los casos y devolver el documento JSON"""
+    resultados = {}
+    for nombre, filas, funcion in casos(tamanos, completo):
+        segundos = medir(funcion, repeticiones)
+        resultados[f'{nombre}[{filas}]'] = {
+            'caso': nombre,
+            'filas': filas,
+            'segundos': segundos,
+            'ns_por_fila': segundos / filas * 1e9,
+        }
+        print(f"   {nombre:<40} {filas:>9} filas | {segundos * 1e3:10.3f} ms | "
+              f"{segundos / filas * 1e9:12.1f} ns/fila", flush=True)
+    return {
+        'metadatos': {
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'semilla': SEMILLA,
+            'tamanos': list(tamanos),
+            'completo': completo,
+        },
+        'resultados': resultados,
+    }
+
+
+def comparar(base, nuevo, umbral):
+    """Casos comunes con su razón de tiempos; devuelve la lista de regresiones"""
+    regresiones = []
+    print(f"   {'Caso':<52} | {'Base':>11} | {'Nuevo':>11} | Razón")
+    print("   " + "-" * 92)
+    for clave, resultado in nuevo['resultados'].items():
+        if clave not in base['resultados']:
+            continue
+        anterior = base['resultados'][clave]['segundos']
+        razon = resultado['segundos'] / anterior
+        marca = ''
+        if razon > 1 + umbral:
+            marca = '  ⚠️ regresión'
+            regresiones.append(clave)
+        elif razon < 1 - umbral:
+            marca = '  ✅ mejora'
+        print(f"   {clave:<52} | {anterior * 1e3:9.3f}ms | {resultado['segundos'] * 1e3:9.3f}ms | "
+              f"{razon:5.2f}x{marca}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    parser_ejecutar = comandos.add_parser('ejecutar', help='Medir todos los casos y guardar el JSON')
+    parser_ejecutar.add_argument('--salida', default='bench_resultados.json')
+    parser_ejecutar.add_argument('--tamanos', default=','.join(map(str, TAMANOS)),
+                                 help='Filas de los conjuntos sintéticos, separadas por comas')
+    parser_ejecutar.add_argument('--completo', action='store_true',
+                                 help='Medir también las funciones escalares con más de 1k filas')
+    parser_ejecutar.add_argument('--repeticiones', type=int, default=5)
+
+    parser_comparar = comandos.add_parser('comparar', help='Comparar dos JSON y marcar regresiones')
+    parser_comparar.add_argument('base')
+    parser_comparar.add_argument('nuevo')
+    parser_comparar.add_argument('--umbral', type=float, default=0.10,
+                                 help='Empeoramiento relativo tolerado (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    if args.comando == 'ejecutar':
+        tamanos = tuple(int(tamano) for tamano in args.tamanos.split(','))
+        print(f"🚀 Benchmarks (semilla {SEMILLA}, tamaños {tamanos}):")
+        documento = ejecutar(tamanos, args.completo, args.repeticiones)
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(documento, archivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {args.salida}")
+        return 0
+
+    with open(args.base, encoding='utf-8') as archivo:
+        base = json.load(archivo)
+    with open(args.nuevo, encoding='utf-8') as archivo:
+        nuevo = json.load(archivo)
+    print(f"📊 Comparación (umbral {args.umbral:.0%}):")
+    regresiones = comparar(base, nuevo, args.umbral)
+    print(f"\n{'⚠️ ' + str(len(regresiones)) + ' regresiones' if regresiones else '✅ Sin regresiones'}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria y asignaciones de TriangularFuzzyProbability
+
+Compara la clase con __slots__ e internado contra una clase de referencia con
+__dict__ por instancia (la disposición anterior) y mide las asignaciones de
+`_interpolate_fuzzy_cpd` y `_normalize_fuzzy_distribution`.
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+from red_bayesiana.triangular import TriangularFuzzyProbability
+
+
+class _FuzzyConDict:
+    """Disposición anterior: un __dict__ por número difuso"""
+    
+    def __init__(self, a, m, b):
+        self.a = a
+        self.m = m
+        self.b = b
+
+
+def _allocated(function, repeticiones):
+    """Bytes y bloques asignados (y aún vivos) por llamada"""
+    resultados = []
+    tracemalloc.start()
+    inicio = tracemalloc.take_snapshot()
+    for _ in range(repeticiones):
+        resultados.append(function())
+    fin = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    
+    stats = fin.compare_to(inicio, 'filename')
+    bytes_total = sum(stat.size_diff for stat in stats)
+    bloques = sum(stat.count_diff for stat in stats)
+    return bytes_total / repeticiones, bloques / repeticiones
+
+
+def medir_memoria_por_instancia(n=100_000):
+    """Bytes por número difuso para cada disposición"""
+    return {
+        'con_dict': _allocated(lambda: _FuzzyConDict(0.1, 0.2, 0.3), n)[0],
+        'slots': _allocated(lambda: TriangularFuzzyProbability(0.1, 0.2, 0.3), n)[0],
+    }
+
+
+def medir_internado():
+    """Números difusos referenciados por a prioris y CPDs frente a objetos distintos"""
+    fbn = TrueFuzzyBayesianNetwork()
+    referencias = []
+    for node in fbn.nodes.values():
+        referencias.extend(node.fuzzy_prior.values())
+        for distribution in node.fuzzy_cpd.values():
+            referencias.extend(distribution.values())
+    return {'referencias': len(referencias), 'objetos': len({id(f) for f in referencias})}
+
+
+def medir_asignaciones(repeticiones=10_000):
+    """Bytes y bloques retenidos por llamada en interpolación y normalización"""
+    fbn = TrueFuzzyBayesianNetwork()
+    parent_states = ('media', 'normal', 'significativa', 'baja')  # Combinación sin regla
+    distribution = fbn._interpolate_fuzzy_cpd('amenaza', parent_states)
+    legacy = {state: _FuzzyConDict(f.a, f.m, f.b) for state, f in distribution.items()}
+    
+    def normalizar_con_dict():
+        total = sum((f.a + f.m + f.b) / 3 for f in legacy.values())
+        return {state: _FuzzyConDict(f.a * ((f.a + f.m + f.b) / 3 / total),
+                                     f.m * ((f.a + f.m + f.b) / 3 / total),
+                                     f.b * ((f.a + f.m + f.b) / 3 / total))
+                for state, f in legacy.items()}
+    
+    return {
+        'interpolacion_por_regla': _allocated(lambda: fbn._closest_fuzzy_rule('amenaza', parent_states)[0],
+                                              repeticiones),
+        'interpolacion_materializada': _allocated(lambda: fbn._interpolate_fuzzy_cpd('amenaza', parent_states),
+                                                  repeticiones),
+        'normalizacion_con_dict': _allocated(normalizar_con_dict, repeticiones),
+        'normalizacion_slots': _allocated(lambda: fbn._normalize_fuzzy_distribution(distribution),
+                                          repeticiones),
+    }
+
+
+def medir_aritmetica(numero=200_000):
+    """Segundos por operación con despacho por tipo y con las rutas rápidas"""
+    x = TriangularFuzzyProbability(0.6, 0.75, 0.9)
+    y = TriangularFuzzyProbability(0.3, 0.5, 0.6)
+    casos = {
+        'suma': lambda: x + y,
+        'suma_rapida': lambda: x.add_fuzzy(y),
+        'producto': lambda: x * y,
+        'producto_rapido': lambda: x.mul_fuzzy(y),
+        'escalar': lambda: x * 0.5,
+        'escalar_rapido': lambda: x.scale(0.5),
+    }
+    return {nombre: min(timeit.repeat(caso, number=numero, repeat=3)) / numero
+            for nombre, caso in casos.items()}
+
+
+def main():
+    memoria = medir_memoria_por_instancia()
+    print("💾 Memoria por número difuso:")
+    print(f"   Con __dict__: {memoria['con_dict']:.1f} B")
+    print(f"   Con __slots__: {memoria['slots']:.1f} B "
+          f"({100 * (1 - memoria['slots'] / memoria['con_dict']):.0f}% menos)")
+    
+    internado = medir_internado()
+    print("\n🔗 Internado de constantes en a prioris y CPDs:")
+    print(f"   {internado['referencias']} referencias → {internado['objetos']} objetos distintos")
+    
+    print("\n♻️ Asignaciones retenidas por llamada (bytes, bloques):")
+    for nombre, (bytes_llamada, bloques) in medir_asignaciones().items():
+        print(f"   {nombre:<28}: {bytes_llamada:8.1f} B, {bloques:5.1f} bloques")
+    
+    print("\n⏱️ Aritmética (ns por operación):")
+    for nombre, segundos in medir_aritmetica().items():
+        print(f"   {nombre:<16}: {segundos * 1e9:6.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,9 @@ implementado para la evaluación de riesgo volcánico, incluyendo:
 - Análisis de sensibilidad
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
-from main import TrueFuzzyBayesianNetwork
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
 from red_bayesiana.triangular import TriangularFuzzyProbability
+from red_bayesiana.sensibilidad import morris_indices, sobol_indices, step_function
 
 def demo_escenarios_volcanicos():
     """Demostración con múltiples escenarios volcánicos"""
@@ -135,7 +134,7 @@ def analisis_sensibilidad():
     print(" " * 20 + "ANÁLISIS DE SENSIBILIDAD")
     print("🔬" * 60)
     
-    fbn = TrueFuzzyBayesianNetwork()
+    fbn = TrueFuzzyBayesianNetwork.shared()
     
     # Configuración base
     evidencia_base = {
@@ -150,35 +149,32 @@ def analisis_sensibilidad():
     }
     
     # Variables a analizar
-    variables_analisis = {
-        'sismicidad': np.arange(1, 20, 3),
-        'gases': np.arange(500, 5000, 500),
-        'deformacion': np.arange(0, 50, 5),
-        'proximidad': np.arange(2, 20, 2)
-    }
+    variables_analisis = ['sismicidad', 'gases', 'deformacion', 'proximidad']
     
     print(f"📊 Configuración base: {evidencia_base}")
     
-    for variable, valores in variables_analisis.items():
+    for variable in variables_analisis:
         print(f"\n🔍 Análisis de sensibilidad para '{variable}':")
         
-        riesgos = []
-        for valor in valores:
-            evidencia_temp = evidencia_base.copy()
-            evidencia_temp[variable] = valor
-            
-            fuzzy_result = fbn.fuzzy_inference(evidencia_temp, 'riesgo', verbose=False)
-            crisp_risk = fbn.defuzzify_distribution(fuzzy_result, 'centroid')
-            riesgos.append(crisp_risk)
-            
-            print(f"   {variable}={valor} → Riesgo={crisp_risk:.2f}")
+        # El riesgo es constante entre puntos de quiebre: una evaluación por segmento
+        escalones = step_function(variable, evidencia_base, network=fbn)
+        bordes = escalones['edges']
+        for i, (estado, riesgo) in enumerate(zip(escalones['states'], escalones['risk'])):
+            print(f"   {variable} ∈ [{bordes[i]:.2f}, {bordes[i + 1]:.2f}) ({estado}) → Riesgo={riesgo:.2f}")
         
-        # Calcular sensibilidad
-        varianza = np.var(riesgos)
-        rango = max(riesgos) - min(riesgos)
-        
-        print(f"   📈 Varianza del riesgo: {varianza:.3f}")
-        print(f"   📏 Rango de variación: {rango:.3f}")
+        print(f"   📈 Varianza del riesgo: {escalones['variance']:.3f}")
+        print(f"   📏 Rango de variación: {escalones['range']:.3f}")
+    
+    # Sensibilidad global sobre las ocho entradas
+    morris = morris_indices(trajectories=500, seed=0, network=fbn)
+    sobol = sobol_indices(n_samples=20_000, seed=0, network=fbn)
+    print(f"\n🌐 Sensibilidad global (Morris: {morris['n_evaluations']} evaluaciones, "
+          f"Sobol: {sobol['n_evaluations']} evaluaciones):")
+    print(f"   {'Variable':<12} | {'mu*':>12} | {'S1':>14} | {'ST':>14}")
+    for i, variable in enumerate(sobol['variables']):
+        print(f"   {variable:<12} | {morris['mu_star'][i]:5.2f} ± {morris['mu_star_conf'][i]:4.2f} | "
+              f"{sobol['S1'][i]:6.3f} ± {sobol['S1_conf'][i]:5.3f} | "
+              f"{sobol['ST'][i]:6.3f} ± {sobol['ST_conf'][i]:5.3f}")
 
 def demo_aritmetica_difusa():
     """Demostración de operaciones aritméticas con números difusos"""
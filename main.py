@@ -1,7 +1,11 @@
 from red_bayesiana.red import TrueFuzzyBayesianNetwork
+from red_bayesiana.registro import DistrictRegistry
+from red_bayesiana.montecarlo import simulate_risk
+from red_bayesiana.raster import generate_risk_map, grid_around_crater
 import numpy as np
-import seaborn as sns
-import pandas as pd
+
+# matplotlib, seaborn y pandas solo se importan dentro de las funciones de gráficos,
+# de modo que importar este módulo no carga librerías de visualización ni abre ventanas
 
 # Rangos exactos según especificación
 PARAMETROS = {
@@ -21,8 +25,8 @@ def evaluar_riesgo_volcanico(distrito):
     print(f"EVALUACIÓN DE RIESGO - {distrito['nombre'].upper()}")
     print("🌋" * 20)
     
-    # Crear red bayesiana con parámetros estandarizados
-    fbn = TrueFuzzyBayesianNetwork()
+    # Red bayesiana compartida: se construye y compila una sola vez por proceso
+    fbn = TrueFuzzyBayesianNetwork.shared()
     
     # Mostrar parámetros de referencia
     print("\n📐 PARÁMETROS DE REFERENCIA:")
@@ -173,30 +177,50 @@ DISTRITOS = {
 }
 
 
-if __name__ == "__main__":
-    print("SISTEMA DE ALERTA TEMPRANA VOLCÁN MISTI\n")
-    print(f"🔹 Rango sismicidad: {PARAMETROS['sismicidad']['min']}-{PARAMETROS['sismicidad']['max']} {PARAMETROS['sismicidad']['unidad']}")
-    print(f"🔹 Rango gases: {PARAMETROS['gases']['min']}-{PARAMETROS['gases']['max']} {PARAMETROS['gases']['unidad']}")
-    print(f"🔹 Máxima deformación: {PARAMETROS['deformacion']['max']} {PARAMETROS['deformacion']['unidad']}\n")
-    
-    # Evaluar todos los distritos
-    resultados = {}
-    for nombre, datos in DISTRITOS.items():
-        resultados[nombre] = evaluar_riesgo_volcanico(datos)
-        print("\n" + "="*50 + "\n")
-    
-    # Resumen comparativo
-    print("📈 RESUMEN COMPARATIVO:")
-    print(f"{'Distrito':<20} | {'Riesgo':<6} | {'Prox (km)':<9} | {'Densidad':<9} | Prep.")
-    print("-"*60)
-    for distrito, riesgo in sorted(resultados.items(), key=lambda x: x[1], reverse=True):
-        datos = DISTRITOS[distrito]
-        print(f"{distrito:<20} | {riesgo:.2f}/10 | {datos['proximidad']:>6.1f} km | {datos['densidad']:>8} | {datos['preparacion']}/5")
+def crear_registro_distritos(distritos=DISTRITOS):
+    """Registra los distritos una sola vez: su vulnerabilidad queda precalculada"""
+    limites = {var: (info['min'], info['max']) for var, info in PARAMETROS.items()}
+    registro = DistrictRegistry(bounds=limites)
+    registro.register_many(distritos)
+    return registro
+
+
+def reevaluar_distritos(registro, actividad_actual):
+    """Riesgo crisp de todos los distritos registrados ante una nueva lectura del volcán"""
+    return registro.scores(actividad_actual)
+
+
+# Distribuciones de la actividad volcánica usadas en las simulaciones
+DISTRIBUCIONES_ACTIVIDAD = {
+    'sismicidad': ('normal', 12, 4),
+    'gases': ('normal', 3500, 800),
+    'deformacion': ('normal', 35, 10)
+}
+
+
+def evaluar_riesgo_montecarlo(n_muestras=100_000, semilla=None, distribuciones=DISTRIBUCIONES_ACTIVIDAD,
+                              distritos=DISTRITOS):
+    """Histograma, probabilidad de superar 4 y 7, y percentiles del riesgo de cada distrito"""
+    registro = crear_registro_distritos(distritos)
+    return simulate_risk(registro, distribuciones, n_muestras, seed=semilla)
 
 
-import matplotlib.pyplot as plt
+def generar_mapa_riesgo(capas, directorio_salida, semiancho_km=20, resolucion_m=100, tamano_tesela=512):
+    """
+    Mapa de riesgo alrededor del cráter del Misti escrito en 'riesgo.npy' y 'estado.npy'
+
+    `capas` asigna a cada variable de entrada (salvo proximidad, que se calcula por
+    celda) un arreglo de la forma de la grilla o un valor constante, p. ej. la actividad actual.
+    """
+    lat, lon = grid_around_crater(semiancho_km, resolucion_m)
+    limites = {var: (info['min'], info['max']) for var, info in PARAMETROS.items()}
+    return generate_risk_map(lat, lon, capas, directorio_salida, bounds=limites, tile_size=tamano_tesela)
+
 
 def graficar_riesgo_distritos(resultados):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     nombres = list(resultados.keys())
     valores = list(resultados.values())
 
@@ -222,6 +246,8 @@ def graficar_riesgo_distritos(resultados):
     plt.show()
 
 def graficar_radar_distrito(nombre, datos):
+    import matplotlib.pyplot as plt
+    
     etiquetas = ['historia', 'densidad', 'preparacion', 'proximidad', 'evacuacion']
     valores = [datos[e] for e in etiquetas]
 
@@ -254,6 +280,10 @@ def graficar_radar_distrito(nombre, datos):
     
 
 def graficar_heatmap_variables(DISTRITOS):
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+    
     df = pd.DataFrame.from_dict(DISTRITOS, orient='index')
     df = df[['historia', 'densidad', 'preparacion', 'proximidad', 'evacuacion']]
     
@@ -266,6 +296,8 @@ def graficar_heatmap_variables(DISTRITOS):
     plt.show()
 
 def graficar_evolucion_riesgo(nombre, riesgo_tiempo):
+    import matplotlib.pyplot as plt
+    
     dias = list(range(len(riesgo_tiempo)))
 
     plt.figure(figsize=(10, 5))
@@ -278,6 +310,9 @@ def graficar_evolucion_riesgo(nombre, riesgo_tiempo):
     plt.show()
 
 def graficar_burbujas(DISTRITOS):
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    
     df = pd.DataFrame.from_dict(DISTRITOS, orient='index')
     plt.figure(figsize=(10, 6))
 
@@ -297,12 +332,32 @@ def graficar_burbujas(DISTRITOS):
     plt.show()
 
 
-# Ejecutar gráfico de barras
-graficar_riesgo_distritos(resultados)
-graficar_heatmap_variables(DISTRITOS)
-# graficar_burbujas(DISTRITOS)
+if __name__ == "__main__":
+    print("SISTEMA DE ALERTA TEMPRANA VOLCÁN MISTI\n")
+    print(f"🔹 Rango sismicidad: {PARAMETROS['sismicidad']['min']}-{PARAMETROS['sismicidad']['max']} {PARAMETROS['sismicidad']['unidad']}")
+    print(f"🔹 Rango gases: {PARAMETROS['gases']['min']}-{PARAMETROS['gases']['max']} {PARAMETROS['gases']['unidad']}")
+    print(f"🔹 Máxima deformación: {PARAMETROS['deformacion']['max']} {PARAMETROS['deformacion']['unidad']}\n")
+    
+    # Evaluar todos los distritos
+    resultados = {}
+    for nombre, datos in DISTRITOS.items():
+        resultados[nombre] = evaluar_riesgo_volcanico(datos)
+        print("\n" + "="*50 + "\n")
+    
+    # Resumen comparativo
+    print("📈 RESUMEN COMPARATIVO:")
+    print(f"{'Distrito':<20} | {'Riesgo':<6} | {'Prox (km)':<9} | {'Densidad':<9} | Prep.")
+    print("-"*60)
+    for distrito, riesgo in sorted(resultados.items(), key=lambda x: x[1], reverse=True):
+        datos = DISTRITOS[distrito]
+        print(f"{distrito:<20} | {riesgo:.2f}/10 | {datos['proximidad']:>6.1f} km | {datos['densidad']:>8} | {datos['preparacion']}/5")
+
+    # Ejecutar gráfico de barras
+    graficar_riesgo_distritos(resultados)
+    graficar_heatmap_variables(DISTRITOS)
+    # graficar_burbujas(DISTRITOS)
 
-# Radar para los 2 distritos más riesgosos
-top2 = sorted(resultados.items(), key=lambda x: x[1], reverse=True)[:2]
-for nombre, _ in top2:
-    graficar_radar_distrito(nombre, DISTRITOS[nombre])
+    # Radar para los 2 distritos más riesgosos
+    top2 = sorted(resultados.items(), key=lambda x: x[1], reverse=True)[:2]
+    for nombre, _ in top2:
+        graficar_radar_distrito(nombre, DISTRITOS[nombre])
@@ -0,0 +1,62 @@
+# Caché LRU acotada para resultados de inferencia
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Caché LRU acotada y segura entre hilos, con contadores de aciertos y fallos"""
+    
+    def __init__(self, maxsize=4096):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize debe ser positivo, recibido: {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Obtener el valor asociado a key (marcándolo como el más reciente) o default"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """Guardar un valor, descartando el menos usado recientemente si se excede maxsize"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Vaciar la caché (los contadores se conservan)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def reset_stats(self):
+        """Poner a cero los contadores de aciertos y fallos"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """Resumen de uso de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+    
+    def __len__(self):
+        return len(self._entries)
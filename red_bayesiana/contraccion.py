@@ -0,0 +1,61 @@
+# Contracciones tensoriales con rutas de contracción cacheadas
+import numpy as np
+
+from red_bayesiana.cache import LRUCache
+
+_opt_einsum = None  # Módulo opt_einsum (False si no está instalado), importado al primer uso
+
+
+def _load_opt_einsum():
+    """Importar opt_einsum solo cuando se necesita; es opcional"""
+    global _opt_einsum
+    if _opt_einsum is None:
+        try:
+            import opt_einsum
+            _opt_einsum = opt_einsum
+        except ImportError:
+            _opt_einsum = False
+    return _opt_einsum or None
+
+
+class ContractionCache:
+    """
+    Cache de rutas de contracción para `einsum`
+
+    La ruta óptima depende solo de la expresión y de las formas de los operandos, así
+    que se calcula una vez por combinación. Si opt_einsum está instalado se guarda una
+    expresión compilada (`contract_expression`); si no, la ruta de `np.einsum_path`.
+    La búsqueda por defecto es voraz ('greedy'): la óptima crece factorialmente con el
+    número de operandos y solo conviene pedirla por llamada con pocos operandos.
+    """
+
+    def __init__(self, maxsize=256):
+        self._expressions = LRUCache(maxsize)
+
+    def einsum(self, subscripts, *operands, optimize='greedy'):
+        """
+        Evaluar `subscripts` sobre los operandos con la ruta cacheada
+
+        Args:
+            optimize: Estrategia de búsqueda de la ruta ('greedy' u 'optimal')
+        """
+        shapes = tuple(np.shape(operand) for operand in operands)
+        key = (subscripts, shapes, optimize)
+        expression = self._expressions.get(key)
+        if expression is None:
+            backend = _load_opt_einsum()
+            if backend is not None:
+                expression = backend.contract_expression(subscripts, *shapes, optimize=optimize)
+            else:
+                expression = np.einsum_path(subscripts, *operands, optimize=optimize)[0]
+            self._expressions.put(key, expression)
+
+        if callable(expression):
+            return expression(*operands)
+        return np.einsum(subscripts, *operands, optimize=expression)
+
+    def clear(self):
+        self._expressions.clear()
+
+    def __len__(self):
+        return len(self._expressions)
@@ -0,0 +1,102 @@
+# Inferencia diagnóstica (hacia atrás) con tablas conjuntas precalculadas
+import numpy as np
+
+from red_bayesiana.triangular import TriangularFuzzyArray
+
+
+class JointTable:
+    """
+    Pesos conjuntos sobre el espacio discreto de estados de los nodos raíz
+
+    Se construye una vez recorriendo el plan de ejecución para todas las
+    combinaciones de estados de las raíces (7 290 en la red del Misti):
+    - `prior`: producto de los pesos a priori de las raíces (centroides normalizados)
+    - `likelihoods[nodo]`: pesos (..., estados) de cada nodo con padres, centroides
+      normalizados de su distribución difusa dada la combinación de raíces
+
+    Igual que en la inferencia hacia adelante, los nodos intermedios pasan a sus hijos
+    su estado más probable. Todos los arreglos son de solo lectura.
+    """
+
+    def __init__(self, network):
+        plan = network.execution_plan()
+        self.variables = tuple(plan.roots)
+        self.states = {name: list(node.states) for name, node in network.nodes.items()}
+        shape = tuple(len(self.states[var]) for var in self.variables)
+
+        prior = np.ones(shape)
+        for axis, var in enumerate(self.variables):
+            weights = network._prior_weights(var)
+            prior = prior * weights.reshape((-1,) + (1,) * (len(shape) - axis - 1))
+        self.prior = prior
+
+        grid = np.indices(shape)
+        codes = {var: grid[j] for j, var in enumerate(self.variables)}
+        self.likelihoods = {}
+        for kernel in plan.kernels.values():
+            centroids = TriangularFuzzyArray.from_stacked(kernel.gather(codes)).centroid()
+            total = centroids.sum(axis=-1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.likelihoods[kernel.name] = np.where(total > 0, centroids / total, 1.0 / centroids.shape[-1])
+            codes[kernel.name] = kernel.best(codes)
+
+        for array in (self.prior, *self.likelihoods.values()):
+            array.setflags(write=False)
+
+    def posterior(self, evidence, variables=None):
+        """
+        Pesos a posteriori (sin normalizar) de las combinaciones de `variables`
+
+        Args:
+            evidence: Diccionario nodo -> código de estado observado
+            variables: Raíces sin evidencia a explicar (por defecto, todas); el resto
+                       de raíces sin evidencia se suman
+
+        Returns:
+            Tupla (variables, pesos) con un eje de `pesos` por variable
+        """
+        index = tuple(evidence.get(var, slice(None)) for var in self.variables)
+        free = [var for var in self.variables if var not in evidence]
+        variables = free if variables is None else list(variables)
+        unknown = [var for var in variables if var not in free]
+        if unknown:
+            raise ValueError(f"Solo se pueden explicar raíces sin evidencia: {unknown}")
+
+        weights = self.prior[index]
+        for node, code in evidence.items():
+            if node in self.likelihoods:
+                weights = weights * self.likelihoods[node][index + (code,)]
+
+        summed = tuple(axis for axis, var in enumerate(free) if var not in variables)
+        if summed:
+            weights = weights.sum(axis=summed)
+        remaining = [var for var in free if var in variables]
+        weights = np.transpose(weights, [remaining.index(var) for var in variables])
+        return variables, weights
+
+    def top_k(self, evidence, variables=None, k=5):
+        """
+        Las k combinaciones de estados más probables de `variables` dada la evidencia
+
+        Returns:
+            Lista de diccionarios {'states': {variable: estado}, 'probability': p},
+            de mayor a menor probabilidad a posteriori
+
+        Raises:
+            ValueError: Si k < 1 o la evidencia tiene probabilidad nula
+        """
+        if k < 1:
+            raise ValueError(f"k debe ser al menos 1, recibido: {k}")
+        variables, weights = self.posterior(evidence, variables)
+        flat = weights.ravel()
+        total = flat.sum()
+        if not total > 0:
+            raise ValueError("La evidencia tiene probabilidad nula en el modelo")
+
+        k = min(k, flat.size)
+        top = np.argpartition(flat, flat.size - k)[flat.size - k:]
+        top = top[np.lexsort((top, -flat[top]))]  # Mayor peso primero; empates por índice
+        codes = np.unravel_index(top, weights.shape)
+        return [{'states': {var: self.states[var][code] for var, code in zip(variables, combination)},
+                 'probability': float(flat[index] / total)}
+                for index, combination in zip(top.tolist(), zip(*(axis.tolist() for axis in codes)))]
@@ -0,0 +1,171 @@
+# Fuzzificación vectorizada con tablas de puntos de quiebre precalculadas
+import struct
+from bisect import bisect_right
+
+import numpy as np
+
+_SIGN_MASK = 0x7FFFFFFFFFFFFFFF
+
+
+def _float_to_key(value):
+    """Entero con el mismo orden que el float (permite biseccionar sobre floats consecutivos)"""
+    bits = struct.unpack('<q', struct.pack('<d', value))[0]
+    return bits if bits >= 0 else -(bits & _SIGN_MASK)
+
+
+def _key_to_float(key):
+    bits = key if key >= 0 else (-key) | ~_SIGN_MASK
+    return struct.unpack('<d', struct.pack('<q', bits))[0]
+
+
+class FuzzyPartition:
+    """
+    Fuzzificador vectorizado de una variable, construido una vez a partir de sus rangos
+
+    Reproduce exactamente `TrueFuzzyBayesianNetwork.crisp_to_fuzzy_state`: membresía
+    triangular por rango, máxima membresía en los extremos del universo y desempate
+    a favor del primer rango. Como el estado ganador es constante a trozos, los puntos
+    donde cambia se localizan al construir la partición (bisección sobre floats
+    consecutivos) y la consulta se reduce a `np.searchsorted`.
+    """
+
+    def __init__(self, ranges, universe, states=None):
+        """
+        Args:
+            ranges: Diccionario estado -> (low, high), en el orden de evaluación
+            universe: Universo de discurso de la variable (se usan sus extremos)
+            states: Orden de los códigos de estado (por defecto, el de `ranges`)
+        """
+        self.range_states = list(ranges)
+        self.states = list(states) if states is not None else self.range_states
+        self.range_codes = np.array([self.states.index(state) for state in self.range_states], dtype=np.intp)
+
+        bounds = list(ranges.values())
+        self.lows = np.array([low for low, _ in bounds], dtype=np.float64)
+        self.highs = np.array([high for _, high in bounds], dtype=np.float64)
+        self.midpoints = np.array([(low + high) / 2 for low, high in bounds], dtype=np.float64)
+        self.rising_degenerate = self.midpoints == self.lows
+        self.falling_degenerate = self.highs == self.midpoints
+        self.rising_denominators = np.where(self.rising_degenerate, 1.0, self.midpoints - self.lows)
+        self.falling_denominators = np.where(self.falling_degenerate, 1.0, self.highs - self.midpoints)
+        self.low_at_edge = self.lows == universe[0]
+        self.high_at_edge = self.highs == universe[-1]
+
+        self.breakpoints, self.segment_codes = self._build_breakpoints()
+        self._breakpoint_list = self.breakpoints.tolist()
+        self._segment_code_list = self.segment_codes.tolist()
+
+    def _range_memberships(self, values):
+        """Membresías (..., rangos) en el orden de evaluación, con las operaciones de la versión escalar"""
+        x = values[..., np.newaxis]
+        with np.errstate(invalid='ignore'):
+            rising = np.where(self.rising_degenerate, 1.0, (x - self.lows) / self.rising_denominators)
+            falling = np.where(self.falling_degenerate, 1.0, (self.highs - x) / self.falling_denominators)
+        membership = np.minimum(1.0, np.maximum(0.0, np.where(x <= self.midpoints, rising, falling)))
+
+        # Manejo especial para valores en los extremos del universo
+        edge = ((x == self.highs) & self.high_at_edge) | ((x == self.lows) & self.low_at_edge)
+        membership = np.where(edge, 1.0, membership)
+        return np.where((self.lows <= x) & (x <= self.highs), membership, 0.0)
+
+    def _argmax_codes(self, values):
+        """Código del rango con mayor membresía (primer máximo) evaluando todas las membresías"""
+        return self.range_codes[np.argmax(self._range_memberships(values), axis=-1)]
+
+    def memberships(self, values):
+        """Vector de membresía completo (N, estados) con columnas en el orden de los códigos"""
+        values = np.asarray(values, dtype=np.float64)
+        memberships = np.zeros(values.shape + (len(self.states),))
+        memberships[..., self.range_codes] = self._range_memberships(values)
+        return memberships
+
+    def codes(self, values):
+        """Códigos de estado para un arreglo de valores crisp"""
+        values = np.asarray(values, dtype=np.float64)
+        codes = self.segment_codes[np.searchsorted(self.breakpoints, values, side='right') - 1]
+
+        # NaN no tiene membresía en ningún rango: gana el primero, como en la versión escalar
+        codes = np.where(np.isnan(values), self.range_codes[0], codes)
+        ambiguous = codes < 0
+        if ambiguous.any():
+            codes[ambiguous] = self._argmax_codes(values[ambiguous])
+        return codes
+
+    def fuzzify(self, values):
+        """Tupla (códigos de estado, vectores de membresía) para un arreglo de valores crisp"""
+        return self.codes(values), self.memberships(values)
+
+    def state_of(self, value):
+        """Estado lingüístico de un único valor crisp sin pasar por NumPy"""
+        if value != value:  # NaN
+            return self.range_states[0]
+        code = self._segment_code_list[bisect_right(self._breakpoint_list, value) - 1]
+        if code < 0:
+            code = int(self._argmax_codes(np.float64(value)))
+        return self.states[code]
+
+    def _build_breakpoints(self):
+        """
+        Calcular los puntos donde cambia el estado ganador y el código de cada segmento
+
+        Entre dos puntos críticos consecutivos (extremos y puntos medios de los rangos)
+        cada membresía es monótona. Si como mucho hay un rango creciente y uno
+        decreciente activos, la secuencia de ganadores no repite estados y cada cambio
+        se localiza exactamente por bisección. En otro caso el segmento se marca con
+        código -1 y se resuelve evaluando las membresías.
+        """
+        critical = np.unique(np.concatenate([self.lows, self.highs, self.midpoints]))
+        critical = critical[np.isfinite(critical)].tolist()
+        winner = lambda key: int(self._argmax_codes(np.float64(_key_to_float(key))))
+
+        # Fuera de todos los rangos no hay membresía: gana el primer rango
+        starts, codes = [-np.inf], [int(self.range_codes[0])]
+        previous = None
+        for point in critical:
+            if previous is not None:
+                self._append_open_interval(previous, point, winner, starts, codes)
+            starts.append(point)
+            codes.append(winner(_float_to_key(point)))
+            previous = point
+        starts.append(float(np.nextafter(previous, np.inf)))
+        codes.append(int(self.range_codes[0]))
+
+        # Fusionar segmentos consecutivos con el mismo código
+        merged_starts, merged_codes = [starts[0]], [codes[0]]
+        for start, code in zip(starts[1:], codes[1:]):
+            if code != merged_codes[-1]:
+                merged_starts.append(start)
+                merged_codes.append(code)
+        return np.array(merged_starts, dtype=np.float64), np.array(merged_codes, dtype=np.intp)
+
+    def _append_open_interval(self, left, right, winner, starts, codes):
+        """Añadir los segmentos del intervalo abierto (left, right)"""
+        first = _float_to_key(left) + 1
+        last = _float_to_key(right) - 1
+        if first > last:
+            return
+
+        active = (self.lows <= left) & (self.highs >= right)
+        rising = active & (right <= self.midpoints)
+        falling = active & (left >= self.midpoints)
+        starts.append(_key_to_float(first))
+        if rising.sum() > 1 or falling.sum() > 1:
+            codes.append(-1)
+            return
+
+        first_code, last_code = winner(first), winner(last)
+        codes.append(first_code)
+        self._bisect_changes(first, last, first_code, last_code, winner, starts, codes)
+
+    def _bisect_changes(self, low, high, low_code, high_code, winner, starts, codes):
+        """Localizar por bisección los floats donde cambia el ganador entre low y high"""
+        if low_code == high_code:
+            return
+        if high - low == 1:
+            starts.append(_key_to_float(high))
+            codes.append(high_code)
+            return
+        middle = (low + high) // 2
+        middle_code = winner(middle)
+        self._bisect_changes(low, middle, low_code, middle_code, winner, starts, codes)
+        self._bisect_changes(middle, high, middle_code, high_code, winner, starts, codes)
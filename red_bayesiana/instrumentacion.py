@@ -0,0 +1,72 @@
+# Instrumentación opcional de la inferencia: tiempos por etapa y uso de reglas
+import threading
+import time
+
+perf_counter_ns = time.perf_counter_ns
+
+
+class InferenceStats:
+    """
+    Contadores de `fuzzy_inference`, activados con `enable_instrumentation`
+
+    Acumula, de forma segura entre hilos:
+    - tiempo monotónico (ns) y número de pasadas por etapa
+    - consultas y aciertos de la caché de inferencia
+    - reglas exactas e interpoladas usadas por nodo
+    - histograma de similitud (estados coincidentes) de las reglas interpoladas por nodo
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Poner todos los contadores a cero"""
+        with self._lock:
+            self.stage_ns = {}
+            self.stage_calls = {}
+            self.queries = 0
+            self.cache_hits = 0
+            self.exact = {}
+            self.interpolated = {}
+            self.similarity = {}
+
+    def lap(self, stage, start):
+        """Sumar el tiempo transcurrido desde `start` a la etapa y devolver el instante actual"""
+        now = perf_counter_ns()
+        with self._lock:
+            self.stage_ns[stage] = self.stage_ns.get(stage, 0) + (now - start)
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+        return now
+
+    def record_query(self, cache_hit):
+        with self._lock:
+            self.queries += 1
+            self.cache_hits += cache_hit
+
+    def record_rule(self, node_name, exact, similarity):
+        """Registrar la regla usada para un nodo: exacta o interpolada con su similitud"""
+        with self._lock:
+            if exact:
+                self.exact[node_name] = self.exact.get(node_name, 0) + 1
+                return
+            self.interpolated[node_name] = self.interpolated.get(node_name, 0) + 1
+            histogram = self.similarity.setdefault(node_name, {})
+            histogram[similarity] = histogram.get(similarity, 0) + 1
+
+    def snapshot(self):
+        """Copia de los contadores como diccionario (tiempos en segundos)"""
+        with self._lock:
+            nodes = sorted(set(self.exact) | set(self.interpolated))
+            return {
+                'queries': self.queries,
+                'cache_hits': self.cache_hits,
+                'stages': {stage: {'calls': self.stage_calls[stage],
+                                   'seconds': elapsed / 1e9,
+                                   'mean_us': elapsed / self.stage_calls[stage] / 1e3}
+                           for stage, elapsed in self.stage_ns.items()},
+                'rules': {node: {'exact': self.exact.get(node, 0),
+                                 'interpolated': self.interpolated.get(node, 0),
+                                 'similarity': dict(sorted(self.similarity.get(node, {}).items()))}
+                          for node in nodes},
+            }
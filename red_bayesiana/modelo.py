@@ -0,0 +1,216 @@
+# Archivos de modelo declarativos: JSON legible y .npz compacto
+import json
+
+import numpy as np
+
+from red_bayesiana.nodo import FuzzyBayesianNode
+from red_bayesiana.triangular import TriangularFuzzyProbability
+
+MODEL_FORMAT = 'red_bayesiana.modelo/1'
+_HEADER_KEY = '__model__'
+
+
+def model_to_dict(network):
+    """
+    Describir la red (nodos, a prioris, CPDs y sistemas difusos) como diccionario JSON
+
+    Formato:
+        {'format': ..., 'nodes': [{'name', 'states', 'parents', 'prior': {estado: [a, m, b]},
+                                   'cpd': [{'rule': [estados de los padres],
+                                            'distribution': {estado: [a, m, b]}}]}],
+         'fuzzy_systems': {variable: {'ranges': {estado: [low, high]}, 'universe': [...]}}}
+    """
+    triangle = lambda fuzzy: [fuzzy.a, fuzzy.m, fuzzy.b]
+    nodes = []
+    for node in network.nodes.values():
+        nodes.append({
+            'name': node.name,
+            'states': list(node.states),
+            'parents': list(node.parents),
+            'prior': {state: triangle(fuzzy) for state, fuzzy in node.fuzzy_prior.items()},
+            'cpd': [{'rule': list(rule),
+                     'distribution': {state: triangle(fuzzy) for state, fuzzy in distribution.items()}}
+                    for rule, distribution in node.fuzzy_cpd.items()],
+        })
+    fuzzy_systems = {
+        variable: {'ranges': {state: [low, high] for state, (low, high) in system['ranges'].items()},
+                   'universe': np.asarray(system['universe']).tolist()}
+        for variable, system in network.fuzzy_systems.items()
+    }
+    return {'format': MODEL_FORMAT, 'nodes': nodes, 'fuzzy_systems': fuzzy_systems}
+
+
+def save_model_json(network, path):
+    """Guardar el modelo de la red en un archivo JSON legible"""
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(model_to_dict(network), output, ensure_ascii=False, indent=1)
+
+
+def save_model_npz(network, path):
+    """
+    Guardar el modelo en un .npz sin comprimir
+
+    La estructura (nombres, estados, padres) va en una cabecera JSON y los números en
+    dos arreglos planos, de modo que leer el modelo abre solo tres miembros del .npz:
+    'values' (float64) con los (a, m, b) de a prioris y reglas, los rangos y los
+    universos, y 'codes' (int16) con los códigos de estado de los padres de cada regla.
+    La cabecera guarda en qué posición de cada arreglo empieza cada bloque. Los códigos
+    de las reglas indexan 'rule_labels' de la cabecera, que incluye las etiquetas
+    intermedias.
+    """
+    header = {'format': MODEL_FORMAT, 'nodes': [], 'fuzzy_systems': {}}
+    values, codes = [], []
+    offset = lambda blocks: sum(len(block) for block in blocks)
+    for node in network.nodes.values():
+        entry = {'name': node.name, 'states': list(node.states), 'parents': list(node.parents)}
+        header['nodes'].append(entry)
+        if node.fuzzy_prior:
+            entry['prior'] = offset(values)
+            values.append([value for state in node.states
+                           for value in (node.fuzzy_prior[state].a, node.fuzzy_prior[state].m,
+                                         node.fuzzy_prior[state].b)])
+        if node.parents:
+            rules = list(node.fuzzy_cpd.items())
+            # Etiquetas por padre: sus estados seguidos de las etiquetas intermedias de las reglas
+            parent_states = [list(network.nodes[parent].states) for parent in node.parents]
+            for j, labels in enumerate(parent_states):
+                labels.extend(sorted({rule[j] for rule, _ in rules} - set(labels)))
+            entry['rule_labels'] = parent_states
+            entry['cpd'] = {'rules': len(rules), 'codes': offset(codes), 'values': offset(values)}
+            codes.append([states.index(state) for rule, _ in rules for states, state in zip(parent_states, rule)])
+            values.append([value for _, distribution in rules for state in node.states
+                           for value in (distribution[state].a, distribution[state].m, distribution[state].b)])
+    for variable, system in network.fuzzy_systems.items():
+        universe = np.asarray(system['universe'])
+        header['fuzzy_systems'][variable] = {
+            'states': list(system['ranges']), 'ranges': offset(values) + len(universe),
+            'universe': [offset(values), len(universe)], 'universe_dtype': universe.dtype.str}
+        values.append(universe.astype(np.float64).tolist())
+        values.append([bound for bounds in system['ranges'].values() for bound in bounds])
+
+    arrays = {'values': np.array([value for block in values for value in block], dtype=np.float64),
+              'codes': np.array([code for block in codes for code in block], dtype=np.int16),
+              _HEADER_KEY: np.frombuffer(json.dumps(header, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)}
+    with open(path, 'wb') as output:
+        np.savez(output, **arrays)
+
+
+def load_model_npz(path):
+    """Leer un .npz de `save_model_npz` como diccionario de modelo (ver `model_to_dict`)"""
+    with np.load(path) as archive:
+        header = json.loads(archive[_HEADER_KEY].tobytes().decode('utf-8'))
+        values_array, codes_array = archive['values'], archive['codes']
+    values, codes = values_array.tolist(), codes_array.tolist()
+    triangles = lambda start, count: [values[i:i + 3] for i in range(start, start + 3 * count, 3)]
+    nodes = []
+    for node in header['nodes']:
+        name, states, parents = node['name'], node['states'], node['parents']
+        prior = {}
+        if 'prior' in node:
+            prior = dict(zip(states, triangles(node['prior'], len(states))))
+        cpd = []
+        if 'cpd' in node:
+            rules, start = node['cpd']['rules'], node['cpd']['codes']
+            distributions = triangles(node['cpd']['values'], rules * len(states))
+            for r in range(rules):
+                rule_codes = codes[start + r * len(parents):start + (r + 1) * len(parents)]
+                cpd.append({'rule': [labels[code] for labels, code in zip(node['rule_labels'], rule_codes)],
+                            'distribution': dict(zip(states, distributions[r * len(states):(r + 1) * len(states)]))})
+        nodes.append({'name': name, 'states': states, 'parents': parents, 'prior': prior, 'cpd': cpd})
+    fuzzy_systems = {}
+    for variable, system in header['fuzzy_systems'].items():
+        start, length = system['universe']
+        bounds = values[system['ranges']:system['ranges'] + 2 * len(system['states'])]
+        fuzzy_systems[variable] = {
+            'ranges': {state: (bounds[2 * j], bounds[2 * j + 1]) for j, state in enumerate(system['states'])},
+            'universe': values_array[start:start + length].astype(system['universe_dtype'])}
+    return {'format': header['format'], 'nodes': nodes, 'fuzzy_systems': fuzzy_systems}
+
+
+def load_model(source):
+    """Obtener el diccionario de modelo desde un diccionario, un .json o un .npz"""
+    if isinstance(source, dict):
+        return source
+    source = str(source)
+    if source.endswith('.npz'):
+        return load_model_npz(source)
+    with open(source, encoding='utf-8') as model_file:
+        return json.load(model_file)
+
+
+def build_model(model):
+    """
+    Construir los nodos y los sistemas difusos descritos por un diccionario de modelo
+
+    Las reglas pueden usar etiquetas intermedias que no son estados del padre (p. ej.
+    'media-alta'): nunca coinciden de forma exacta, pero sirven de referencia para la
+    interpolación de `_closest_fuzzy_rule`.
+
+    Returns:
+        Tupla (nodos, sistemas_difusos) en el formato de `TrueFuzzyBayesianNetwork`
+
+    Raises:
+        ValueError: Si el formato no es compatible o el modelo es inconsistente
+    """
+    if model.get('format') != MODEL_FORMAT:
+        raise ValueError(f"Formato de modelo no soportado: {model.get('format')!r}")
+
+    nodes = {}
+    for spec in model['nodes']:
+        nodes[spec['name']] = FuzzyBayesianNode(spec['name'], list(spec['states']), list(spec['parents']))
+    for spec in model['nodes']:
+        node = nodes[spec['name']]
+        missing = [parent for parent in node.parents if parent not in nodes]
+        if missing:
+            raise ValueError(f"Nodo '{node.name}': padres desconocidos {missing}")
+        if spec.get('prior'):
+            node.set_fuzzy_prior(_distribution(node, spec['prior']))
+        cpd = {}
+        for entry in spec.get('cpd', []):
+            rule = tuple(entry['rule'])
+            if len(rule) != len(node.parents) or not all(isinstance(state, str) for state in rule):
+                raise ValueError(f"Nodo '{node.name}': regla inválida {list(rule)}")
+            cpd[rule] = _distribution(node, entry['distribution'])
+        if cpd:
+            node.set_fuzzy_cpd(cpd)
+    _check_acyclic(nodes)
+
+    fuzzy_systems = {}
+    for variable, system in model['fuzzy_systems'].items():
+        ranges = {state: (bounds[0], bounds[1]) for state, bounds in system['ranges'].items()}
+        if variable in nodes and set(ranges) != set(nodes[variable].states):
+            raise ValueError(f"Los rangos de '{variable}' no corresponden a los estados del nodo")
+        fuzzy_systems[variable] = {'ranges': ranges, 'universe': np.asarray(system['universe'])}
+    return nodes, fuzzy_systems
+
+
+def _check_acyclic(nodes):
+    """Verificar que los padres formen un grafo acíclico"""
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"El modelo contiene un ciclo que pasa por '{name}'")
+        visiting.add(name)
+        for parent in nodes[name].parents:
+            visit(parent)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in nodes:
+        visit(name)
+
+
+def _distribution(node, values):
+    """Distribución {estado: TriangularFuzzyProbability} validada contra los estados del nodo"""
+    if set(values) != set(node.states):
+        raise ValueError(f"Nodo '{node.name}': la distribución debe cubrir los estados {node.states}")
+    distribution = {}
+    for state in node.states:
+        a, m, b = (float(value) for value in values[state])
+        if not a <= m <= b:
+            raise ValueError(f"Nodo '{node.name}', estado '{state}': se requiere a <= m <= b")
+        distribution[state] = TriangularFuzzyProbability.intern(a, m, b)
+    return distribution
@@ -1,3 +1,6 @@
+from types import MappingProxyType
+
+
 class FuzzyBayesianNode:
     """Nodo de una Red Bayesiana Difusa"""
     
@@ -7,11 +10,71 @@ class FuzzyBayesianNode:
         self.parents = parents or []
         self.fuzzy_cpd = {}  # CPD con números difusos
         self.fuzzy_prior = {}  # Distribución a priori difusa
+        self.listeners = []  # Funciones a llamar cuando cambia la CPD o la distribución a priori
+        self.frozen = False  # Un nodo congelado no admite cambios (ver `freeze`)
+        self.clear_compiled_cpd()
     
     def set_fuzzy_prior(self, fuzzy_distribution):
         """Establecer distribución a priori difusa"""
+        self._check_mutable()
         self.fuzzy_prior = fuzzy_distribution
+        self._notify_listeners()
     
     def set_fuzzy_cpd(self, fuzzy_cpd):
         """Establecer CPD difusa"""
-        self.fuzzy_cpd = fuzzy_cpd
\ No newline at end of file
+        self._check_mutable()
+        self.fuzzy_cpd = fuzzy_cpd
+        self.clear_compiled_cpd()
+        self._notify_listeners()
+    
+    def add_listener(self, listener):
+        """Registrar una función listener(nodo) que se llama al cambiar la CPD o la a priori"""
+        self.listeners.append(listener)
+    
+    def _notify_listeners(self):
+        for listener in self.listeners:
+            listener(self)
+    
+    def clear_compiled_cpd(self):
+        """Descartar la CPD compilada para que se vuelva a generar en el próximo uso"""
+        self.cpd_tensor = None  # (estados de cada padre..., estados, 3) con (a, m, b)
+        self.cpd_similarity = None  # Similitud de la regla usada (len(parents) si es exacta)
+        self.cpd_best_state = None  # Índice del estado con mayor centroide
+        self.interpolated_cpd = None  # Distribuciones interpoladas por combinación de padres
+    
+    @property
+    def is_compiled(self):
+        """Indica si la CPD difusa ya está compilada en tensores densos"""
+        return self.cpd_tensor is not None
+    
+    def freeze(self):
+        """Volver inmutables la CPD, la distribución a priori y las interpolaciones del nodo"""
+        self.fuzzy_cpd = _frozen_cpd(self.fuzzy_cpd)
+        self.fuzzy_prior = MappingProxyType(dict(self.fuzzy_prior))
+        if self.interpolated_cpd is not None:
+            self.interpolated_cpd = _frozen_cpd(self.interpolated_cpd)
+        self.frozen = True
+    
+    def copy(self):
+        """Copia modificable del nodo (reglas y a priori) que comparte la CPD compilada"""
+        node = FuzzyBayesianNode(self.name, list(self.states), list(self.parents))
+        node.fuzzy_cpd = dict(self.fuzzy_cpd)
+        node.fuzzy_prior = dict(self.fuzzy_prior)
+        
+        # Lo compilado es de solo lectura y se reemplaza entero al recompilar: se comparte
+        node.cpd_tensor = self.cpd_tensor
+        node.cpd_similarity = self.cpd_similarity
+        node.cpd_best_state = self.cpd_best_state
+        node.interpolated_cpd = self.interpolated_cpd
+        return node
+    
+    def _check_mutable(self):
+        if self.frozen:
+            raise RuntimeError(f"El nodo '{self.name}' pertenece a una red congelada; "
+                               f"use clone() para obtener una copia modificable")
+
+
+def _frozen_cpd(fuzzy_cpd):
+    """Vista de solo lectura de una CPD difusa (reglas y distribuciones)"""
+    return MappingProxyType({rule: MappingProxyType(dict(distribution))
+                             for rule, distribution in fuzzy_cpd.items()})
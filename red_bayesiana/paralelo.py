@@ -0,0 +1,86 @@
+# Evaluación paralela por procesos de registros grandes (manzanas, celdas, distritos)
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+
+# Red del proceso trabajador, cargada una sola vez por el inicializador del pool
+_worker_network = None
+
+
+def _init_worker(precompute):
+    """Inicializador del pool: construye y compila la red una vez por proceso"""
+    global _worker_network
+    _worker_network = TrueFuzzyBayesianNetwork.shared(precompute=precompute)
+
+
+def _evaluate_chunk(task):
+    """Evaluar un bloque de filas en el proceso trabajador"""
+    evidence, return_distributions = task
+    distributions, crisp = _worker_network.fuzzy_inference_batch(evidence)
+    return (distributions if return_distributions else None), crisp
+
+
+class ParallelEvaluator:
+    """
+    Ejecutor paralelo de `fuzzy_inference_batch` sobre un pool de procesos
+
+    La evidencia se divide en bloques de `chunk_size` filas que se reparten entre los
+    procesos; los resultados se devuelven en el orden de entrada. Usar como gestor de
+    contexto (o llamar a `close`) para liberar los procesos.
+    """
+
+    def __init__(self, workers=None, chunk_size=10000, precompute=True):
+        """
+        Args:
+            workers: Número de procesos (por defecto, `os.cpu_count()`)
+            chunk_size: Filas por tarea enviada a un proceso
+            precompute: Usar la tabla de riesgo precalculada en cada proceso
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size debe ser positivo, recibido: {chunk_size}")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.precompute = precompute
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(precompute,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Terminar los procesos del pool"""
+        self._executor.shutdown()
+
+    def _chunks(self, evidence_batch):
+        """Bloques consecutivos de filas (arreglo o DataFrame)"""
+        rows = evidence_batch.iloc if hasattr(evidence_batch, 'iloc') else np.asarray(evidence_batch)
+        for start in range(0, len(evidence_batch), self.chunk_size):
+            yield rows[start:start + self.chunk_size]
+
+    def evaluate(self, evidence_batch, return_distributions=True):
+        """
+        Evaluar un lote de evidencias en paralelo
+
+        Args:
+            evidence_batch: Arreglo (N, 8) o DataFrame, como en `fuzzy_inference_batch`
+            return_distributions: Devolver también las distribuciones (N, estados, 3);
+                                  desactivarlo reduce la transferencia entre procesos
+
+        Returns:
+            Tupla (distribuciones o None, riesgo_crisp) en el orden de entrada
+        """
+        tasks = ((chunk, return_distributions) for chunk in self._chunks(evidence_batch))
+        results = list(self._executor.map(_evaluate_chunk, tasks))
+        if not results:
+            raise ValueError("La evidencia por lotes está vacía")
+
+        crisp = np.concatenate([chunk_crisp for _, chunk_crisp in results])
+        if not return_distributions:
+            return None, crisp
+        return np.concatenate([distributions for distributions, _ in results]), crisp
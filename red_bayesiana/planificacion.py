@@ -0,0 +1,147 @@
+# Plan de ejecución de la red: orden topológico y núcleos compilados por nodo
+from red_bayesiana.cache import LRUCache
+
+
+class NodeKernel:
+    """
+    Cálculo compilado de un nodo con padres
+
+    Captura los tensores de la CPD compilada del nodo y los códigos de estado de sus
+    padres, de modo que resolver una combinación de padres es un único índice:
+    `gather`/`best` para lotes de códigos y `lookup` para una consulta escalar por
+    estados lingüísticos (regla exacta o su interpolación materializada).
+    """
+
+    def __init__(self, network, name):
+        node = network.compiled_node(name)
+        self.name = name
+        self.node = node
+        self.parents = tuple(node.parents)
+        self.states = list(node.states)
+        self.parent_codes = tuple({state: code for code, state in enumerate(network.nodes[parent].states)}
+                                  for parent in self.parents)
+        self.tensor = node.cpd_tensor
+        self.similarity = node.cpd_similarity
+        self.best_state = node.cpd_best_state
+
+    def gather(self, codes):
+        """Distribuciones (..., estados, 3) para los códigos de estado de los padres"""
+        return self.tensor[tuple(codes[parent] for parent in self.parents)]
+
+    def best(self, codes):
+        """Código del estado más probable para los códigos de estado de los padres"""
+        return self.best_state[tuple(codes[parent] for parent in self.parents)]
+
+    def lookup(self, parent_states):
+        """
+        Resolver una combinación de estados de los padres
+
+        Returns:
+            Tupla (distribución, estado más probable, similitud); la similitud es
+            len(parents) cuando existe la regla exacta
+        """
+        index = tuple(codes[state] for codes, state in zip(self.parent_codes, parent_states))
+        similarity = int(self.similarity[index])
+        if similarity == len(self.parents):
+            distribution = self.node.fuzzy_cpd[parent_states]
+        else:
+            distribution = self.node.interpolated_cpd[parent_states]
+        return distribution, self.states[self.best_state[index]], similarity
+
+
+class ExecutionPlan:
+    """
+    Orden topológico de la red y núcleo de cada nodo con padres, calculados una vez
+
+    El plan se obtiene con `TrueFuzzyBayesianNetwork.execution_plan()` y se descarta
+    cuando cambia una CPD o se añade un nodo. `steps(targets)` devuelve solo los
+    núcleos de los ancestros de los objetivos, de modo que el coste de una consulta
+    no depende de los nodos que no intervienen en ella.
+    """
+
+    def __init__(self, network):
+        self.roots = [name for name, node in network.nodes.items() if not node.parents]
+        self.order = _topological_order(network.nodes)
+        self.kernels = {name: NodeKernel(network, name) for name in self.order}  # En orden topológico
+        self._steps = LRUCache(64)
+
+    def steps(self, targets):
+        """Núcleos necesarios para calcular los objetivos, en orden topológico"""
+        return self._schedule(tuple(targets))[0]
+
+    def inputs(self, targets):
+        """Nodos raíz de los que dependen los objetivos, en el orden de la red"""
+        return self._schedule(tuple(targets))[2]
+
+    def _schedule(self, targets):
+        """
+        Tupla (núcleos en orden topológico, nodos cuyo estado necesita algún hijo,
+        nodos raíz ancestros de los objetivos)
+        """
+        schedule = self._steps.get(targets)
+        if schedule is None:
+            needed = set()
+            pending = list(targets)
+            while pending:
+                name = pending.pop()
+                if name not in needed:
+                    needed.add(name)
+                    pending.extend(self.kernels[name].parents if name in self.kernels else ())
+            steps = [self.kernels[name] for name in self.order if name in needed]
+            feeding = {parent for kernel in steps for parent in kernel.parents}
+            schedule = (steps, frozenset(kernel.name for kernel in steps if kernel.name in feeding),
+                        tuple(name for name in self.roots if name in needed))
+            self._steps.put(targets, schedule)
+        return schedule
+
+    def run_batch(self, codes, targets):
+        """
+        Propagar lotes de códigos de estado hasta los objetivos
+
+        Cada nodo intermedio pasa a sus hijos el código de su estado más probable;
+        para los objetivos se devuelven sus distribuciones.
+
+        Args:
+            codes: Diccionario nodo raíz -> arreglo de códigos de estado
+            targets: Nodos con padres cuyas distribuciones se devuelven
+
+        Returns:
+            Diccionario objetivo -> arreglo (..., estados, 3)
+        """
+        codes = self.propagate(codes, targets)
+        return {target: self.kernels[target].gather(codes) for target in targets}
+
+    def propagate(self, codes, targets):
+        """Añadir a los códigos los de los nodos intermedios que necesitan los objetivos"""
+        codes = dict(codes)
+        steps, feeding, _ = self._schedule(tuple(targets))
+        for kernel in steps:
+            if kernel.name in feeding:
+                codes[kernel.name] = kernel.best(codes)
+        return codes
+
+
+def _topological_order(nodes):
+    """Nodos con padres en orden topológico (búsqueda en profundidad en el orden de `nodes`)"""
+    order = []
+    done, visiting = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"La red contiene un ciclo que pasa por '{name}'")
+        node = nodes[name]
+        visiting.add(name)
+        for parent in node.parents:
+            if parent not in nodes:
+                raise ValueError(f"Nodo '{name}': padre desconocido '{parent}'")
+            visit(parent)
+        visiting.discard(name)
+        done.add(name)
+        if node.parents:
+            order.append(name)
+
+    for name in nodes:
+        visit(name)
+    return order
@@ -0,0 +1,113 @@
+# Mapas de riesgo sobre una grilla lat/lon alrededor del cráter del Misti
+import os
+
+import numpy as np
+
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+from red_bayesiana.triangular import TriangularFuzzyArray
+
+# Cráter del volcán Misti (grados decimales)
+MISTI_CRATER = (-16.2944, -71.4089)
+EARTH_RADIUS_KM = 6371.0088
+
+
+def distance_to_crater_km(lat, lon, crater=MISTI_CRATER):
+    """Distancia de gran círculo (haversine) en km, vectorizada con broadcasting"""
+    lat = np.radians(lat)
+    lon = np.radians(lon)
+    crater_lat, crater_lon = np.radians(crater[0]), np.radians(crater[1])
+    h = (np.sin((lat - crater_lat) / 2) ** 2
+         + np.cos(lat) * np.cos(crater_lat) * np.sin((lon - crater_lon) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(h))
+
+
+def grid_around_crater(half_width_km, resolution_m, crater=MISTI_CRATER):
+    """
+    Ejes de una grilla regular centrada en el cráter
+
+    Returns:
+        Tupla (lat, lon) de arreglos 1-D; las filas van de norte a sur
+    """
+    km_per_degree = np.pi * EARTH_RADIUS_KM / 180
+    half_lat = half_width_km / km_per_degree
+    half_lon = half_width_km / (km_per_degree * np.cos(np.radians(crater[0])))
+    cells = int(np.ceil(2 * half_width_km * 1000 / resolution_m))
+    lat = np.linspace(crater[0] + half_lat, crater[0] - half_lat, cells)
+    lon = np.linspace(crater[1] - half_lon, crater[1] + half_lon, cells)
+    return lat, lon
+
+
+def _layer_tile(layer, rows, cols):
+    """Ventana de una capa 2-D (o escalar constante) para las filas y columnas dadas"""
+    if np.ndim(layer) == 0:
+        return np.full((rows.stop - rows.start, cols.stop - cols.start), float(layer))
+    return np.asarray(layer[rows, cols], dtype=np.float64)
+
+
+def generate_risk_map(lat, lon, layers, output_dir, network=None, bounds=None, tile_size=512,
+                      crater=MISTI_CRATER):
+    """
+    Evaluar la red sobre una grilla lat/lon escribiendo el resultado en archivos .npy
+
+    'proximidad' se calcula en cada celda como la distancia al cráter; el resto de
+    variables de entrada se leen de `layers`. La grilla se recorre por teselas de
+    `tile_size` x `tile_size` celdas y cada tesela se escribe directamente en los
+    archivos de salida mapeados en memoria, por lo que el pico de memoria depende del
+    tamaño de tesela y no del de la grilla.
+
+    Args:
+        lat: Latitudes de las filas, arreglo (H,)
+        lon: Longitudes de las columnas, arreglo (W,)
+        layers: Diccionario variable -> arreglo (H, W) (p. ej. `np.load(..., mmap_mode='r')`)
+                o valor escalar constante en toda la grilla
+        output_dir: Directorio donde se crean 'riesgo.npy' y 'estado.npy'
+        network: Red a usar (por defecto, `TrueFuzzyBayesianNetwork.shared()`)
+        bounds: Diccionario opcional variable -> (mínimo, máximo) para recortar valores
+        tile_size: Lado de la tesela en celdas
+        crater: Coordenadas (lat, lon) desde las que se mide 'proximidad'
+
+    Returns:
+        Tupla (riesgo, estado) de `np.memmap`: riesgo crisp float64 (H, W) y código int8
+        del estado de mayor centroide ('bajo', 'medio', 'alto' en el orden del nodo)
+    """
+    network = network if network is not None else TrueFuzzyBayesianNetwork.shared()
+    bounds = bounds or {}
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    variables = network.input_variables
+    missing = [var for var in variables if var != 'proximidad' and var not in layers]
+    if missing:
+        raise ValueError(f"Faltan capas para: {missing}")
+    shape = (len(lat), len(lon))
+    for var, layer in layers.items():
+        if np.ndim(layer) != 0 and np.shape(layer) != shape:
+            raise ValueError(f"La capa '{var}' debe tener forma {shape}, recibido: {np.shape(layer)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    risk = np.lib.format.open_memmap(os.path.join(output_dir, 'riesgo.npy'),
+                                     mode='w+', dtype=np.float64, shape=shape)
+    state = np.lib.format.open_memmap(os.path.join(output_dir, 'estado.npy'),
+                                      mode='w+', dtype=np.int8, shape=shape)
+
+    for row in range(0, shape[0], tile_size):
+        rows = slice(row, min(row + tile_size, shape[0]))
+        for col in range(0, shape[1], tile_size):
+            cols = slice(col, min(col + tile_size, shape[1]))
+            tile = {var: _layer_tile(layers[var], rows, cols)
+                    for var in variables if var != 'proximidad'}
+            tile['proximidad'] = distance_to_crater_km(lat[rows, np.newaxis], lon[np.newaxis, cols], crater)
+
+            evidence = np.empty((tile['proximidad'].size, len(variables)))
+            for j, var in enumerate(variables):
+                values = tile[var].ravel()
+                evidence[:, j] = np.clip(values, *bounds[var]) if var in bounds else values
+
+            distributions, crisp = network.fuzzy_inference_batch(evidence)
+            tile_shape = tile['proximidad'].shape
+            risk[rows, cols] = crisp.reshape(tile_shape)
+            state[rows, cols] = np.argmax(TriangularFuzzyArray.from_stacked(distributions).centroid(),
+                                          axis=-1).reshape(tile_shape)
+
+    risk.flush()
+    state.flush()
+    return risk, state
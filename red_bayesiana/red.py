@@ -1,16 +1,272 @@
+import copy
+import threading
+from types import MappingProxyType
+
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
-from red_bayesiana.triangular import TriangularFuzzyProbability
+from red_bayesiana.triangular import TriangularFuzzyProbability, TriangularFuzzyArray, AlphaCutArray
 from red_bayesiana.nodo import FuzzyBayesianNode 
+from red_bayesiana.fuzzificacion import FuzzyPartition
+from red_bayesiana.cache import LRUCache
+from red_bayesiana.contraccion import ContractionCache
+from red_bayesiana.instrumentacion import InferenceStats, perf_counter_ns
+from red_bayesiana.traza import InferenceTrace
+from red_bayesiana.modelo import build_model, load_model
+from red_bayesiana.planificacion import ExecutionPlan
+from red_bayesiana.diagnostico import JointTable
 
 class TrueFuzzyBayesianNetwork:
     """Red Bayesiana Difusa verdadera con inferencia difusa completa"""
     
-    def __init__(self):
+    _shared_instances = {}  # precompute -> red compartida (ver `shared`)
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, precompute=False, cache_size=4096, model=None):
+        """
+        Args:
+            precompute: Si materializar la tabla de riesgo para todo el espacio de
+                        evidencia discretizado (ver `precompute_risk_table`). Solo
+                        acelera `fuzzy_inference_batch` con objetivo 'riesgo';
+                        `fuzzy_inference` ya resuelve cada nodo con un índice sobre
+                        las CPDs compiladas y memoiza sus resultados
+            cache_size: Máximo de resultados memoizados por `fuzzy_inference`
+                        (0 o None desactiva la caché)
+            model: Modelo declarativo (ruta .json/.npz o diccionario, ver
+                   `red_bayesiana.modelo`); None construye la red del Misti
+        
+        Raises:
+            ValueError: Si el modelo es inválido o `diagnose_network` reporta problemas
+        """
         self.nodes = {}
         self.fuzzy_systems = {}
-        self._create_network()
+        self.fuzzifiers = {}  # Fuzzificadores vectorizados por variable (ver `fuzzifier`)
+        self.precompute = precompute
+        self.risk_table = None
+        self.risk_table_crisp = None
+        self.alpha_tables = {}  # Niveles alfa -> tablas de cortes de 'riesgo' (ver `alpha_risk_table`)
+        self.marginal_tables = {}  # (objetivo, raíces sin observar) -> tablas marginales (ver `marginal_table`)
+        self.partial_tables = {}  # Objetivo -> tabla extendida con lecturas faltantes (ver `_fill_missing`)
+        self.joint = None  # JointTable de la inferencia diagnóstica (ver `joint_table`)
+        self.contractions = ContractionCache()  # Rutas de einsum de la inferencia con evidencia blanda
+        self.instrumentation = None  # InferenceStats cuando la instrumentación está activa
+        self.trace = None  # InferenceTrace cuando las trazas están activas
+        self.plan = None  # ExecutionPlan compilado en el primer uso (ver `execution_plan`)
+        self.frozen = False
+        self.inference_cache = LRUCache(cache_size) if cache_size else None
+        if model is None:
+            self._create_network()
+        else:
+            self.nodes, self.fuzzy_systems = build_model(load_model(model))
+            issues = self.diagnose_network()
+            if issues:
+                raise ValueError("Modelo inválido: " + "; ".join(issues))
+        
+        for node in self.nodes.values():
+            node.add_listener(self._on_node_change)
+        if precompute:
+            self.precompute_risk_table()
+    
+    @classmethod
+    def shared(cls, precompute=True):
+        """
+        Obtener la red compartida del proceso, construida y compilada una sola vez
+        
+        La red devuelta está congelada (ver `freeze`): es inmutable y segura para usarse
+        desde varios hilos y en llamadas repetidas. Para modificarla, usar `clone()`.
+        """
+        network = cls._shared_instances.get(precompute)
+        if network is None:
+            with cls._shared_lock:
+                network = cls._shared_instances.get(precompute)
+                if network is None:
+                    network = cls(precompute=precompute).freeze()
+                    cls._shared_instances[precompute] = network
+        return network
+    
+    def freeze(self):
+        """
+        Compilar todo lo necesario para la inferencia y volver la red inmutable
+        
+        Se compilan las CPDs, los fuzzificadores y (con `precompute`) la tabla de riesgo;
+        después la inferencia solo lee estructuras de solo lectura, por lo que la red
+        puede compartirse entre hilos. Devuelve la propia red.
+        """
+        if self.frozen:
+            return self
+        
+        self.compile_fuzzy_cpds()
+        self.execution_plan()
+        for variable in self.fuzzy_systems:
+            self.fuzzifier(variable)
+        if self.precompute and self.risk_table is None:
+            self.precompute_risk_table()
+        
+        for node in self.nodes.values():
+            node.freeze()
+        self.fuzzy_systems = MappingProxyType({
+            variable: MappingProxyType({
+                'ranges': MappingProxyType(dict(system['ranges'])),
+                'universe': _read_only(system['universe'])
+            })
+            for variable, system in self.fuzzy_systems.items()
+        })
+        self.frozen = True
+        return self
+    
+    def clone(self):
+        """
+        Copia modificable de la red sin volver a construirla
+        
+        Comparte los números difusos (inmutables), los tensores compilados, los
+        fuzzificadores y la tabla precalculada; cualquier cambio posterior en la
+        copia invalida solo sus propios resultados compilados.
+        """
+        network = copy.copy(self)
+        network.nodes = {name: node.copy() for name, node in self.nodes.items()}
+        network.fuzzy_systems = {
+            variable: {'ranges': dict(system['ranges']), 'universe': np.array(system['universe'])}
+            for variable, system in self.fuzzy_systems.items()
+        }
+        network.fuzzifiers = dict(self.fuzzifiers)
+        network.alpha_tables = dict(self.alpha_tables)
+        network.marginal_tables = dict(self.marginal_tables)
+        network.partial_tables = {}
+        network.instrumentation = None
+        network.trace = None
+        network.plan = None
+        network.frozen = False
+        if self.inference_cache is not None:
+            network.inference_cache = LRUCache(self.inference_cache.maxsize)
+        for node in network.nodes.values():
+            node.add_listener(network._on_node_change)
+        return network
+    
+    def _on_node_change(self, node):
+        """Invalidar los resultados precalculados cuando cambia una CPD o una a priori"""
+        self.risk_table = None
+        self.risk_table_crisp = None
+        self.alpha_tables = {}
+        self.marginal_tables = {}
+        self.partial_tables = {}
+        self.joint = None
+        self.plan = None
+        self.invalidate_cache()
+    
+    def execution_plan(self):
+        """
+        Obtener el plan de ejecución de la red (orden topológico y núcleos por nodo)
+        
+        Se compila a partir de los padres de cada `FuzzyBayesianNode` en el primer uso
+        y se descarta al cambiar una CPD o al añadir un nodo (ver `ExecutionPlan`).
+        """
+        plan = self.plan
+        if plan is None:
+            plan = ExecutionPlan(self)
+            self.plan = plan
+        return plan
+    
+    def add_node(self, node, fuzzy_system=None):
+        """
+        Añadir un nodo a la red
+        
+        Args:
+            node: FuzzyBayesianNode cuyos padres ya pertenecen a la red
+            fuzzy_system: Diccionario {'ranges': {estado: (low, high)}, 'universe': ...}
+                          para fuzzificar la evidencia crisp de un nodo raíz
+        """
+        if self.frozen:
+            raise RuntimeError("La red está congelada; use clone() para obtener una copia modificable")
+        if node.name in self.nodes:
+            raise ValueError(f"El nodo '{node.name}' ya existe en la red")
+        missing = [parent for parent in node.parents if parent not in self.nodes]
+        if missing:
+            raise ValueError(f"Nodo '{node.name}': padres desconocidos {missing}")
+        
+        self.nodes[node.name] = node
+        if fuzzy_system is not None:
+            self.fuzzy_systems[node.name] = fuzzy_system
+            self.fuzzifiers.pop(node.name, None)
+        node.add_listener(self._on_node_change)
+        self._on_node_change(node)
+    
+    def invalidate_cache(self):
+        """Descartar los resultados memoizados de `fuzzy_inference`"""
+        if self.inference_cache is not None:
+            self.inference_cache.clear()
+    
+    def cache_stats(self):
+        """Aciertos, fallos y ocupación de la caché de inferencia (None si está desactivada)"""
+        return self.inference_cache.stats() if self.inference_cache is not None else None
+    
+    def enable_instrumentation(self):
+        """
+        Activar los contadores de `fuzzy_inference` y `defuzzify_distribution`
+        
+        Con la instrumentación desactivada (por defecto) cada etapa solo comprueba
+        que `self.instrumentation` es None. Devuelve el objeto InferenceStats.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = InferenceStats()
+        return self.instrumentation
+    
+    def disable_instrumentation(self):
+        """Desactivar la instrumentación y descartar sus contadores"""
+        self.instrumentation = None
+    
+    def stats(self):
+        """Copia de los tiempos por etapa y del uso de reglas (None si no está activa)"""
+        return self.instrumentation.snapshot() if self.instrumentation is not None else None
+    
+    def reset_stats(self):
+        """Poner a cero los contadores de la instrumentación"""
+        if self.instrumentation is not None:
+            self.instrumentation.reset()
+    
+    def enable_tracing(self, capacity=1024):
+        """
+        Registrar cada llamada a `fuzzy_inference` en un búfer circular de `capacity` trazas
+        
+        Las trazas sustituyen a las impresiones de `verbose` para explicar cada alerta
+        (ver `InferenceTrace`); se exportan con `self.trace.export_jsonl(ruta)`.
+        Con las trazas desactivadas solo se comprueba que `self.trace` es None.
+        """
+        if self.trace is None or self.trace.capacity != capacity:
+            self.trace = InferenceTrace(capacity)
+        return self.trace
+    
+    def disable_tracing(self):
+        """Desactivar las trazas y descartar las registradas"""
+        self.trace = None
+    
+    def _trace_record(self, evidence_crisp, evidence_linguistic, targets):
+        """Registro de traza de una consulta, obtenido de las CPDs compiladas"""
+        states = dict(evidence_linguistic)
+        nodes = {}
+        plan = self.execution_plan()
+        for kernel in plan.steps(targets):
+            name = kernel.name
+            if not all(parent in states for parent in kernel.parents):
+                continue
+            rule = tuple(states[parent] for parent in kernel.parents)
+            _, states[name], similarity = kernel.lookup(rule)
+            nodes[name] = {
+                'rule': list(rule),
+                'exact': similarity == len(rule),
+                'similarity': similarity,
+                'state': states[name],
+            }
+        
+        # Objetivos sin todos sus padres: se marginalizan las raíces sin lectura
+        for name in targets:
+            if name in plan.kernels and name not in nodes:
+                nodes[name] = {'marginalized': [var for var in plan.inputs((name,))
+                                                if var not in evidence_linguistic]}
+        return {
+            'target': targets[0] if len(targets) == 1 else list(targets),
+            'evidence': {var: float(value) if np.isfinite(value) else None  # JSON estándar: null
+                         for var, value in evidence_crisp.items()},
+            'states': dict(evidence_linguistic),
+            'nodes': nodes,
+        }
     
     def _create_network(self):
         """Crear la estructura de la red con nodos difusos"""
@@ -45,71 +301,71 @@ class TrueFuzzyBayesianNetwork:
         
         # Distribuciones a priori difusas para nodos raíz
         self.nodes['sismicidad'].set_fuzzy_prior({
-            'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'media': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-            'alta': TriangularFuzzyProbability(0.1, 0.2, 0.3)
+            'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'media': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+            'alta': TriangularFuzzyProbability.intern(0.1, 0.2, 0.3)
         })
         
         self.nodes['gases'].set_fuzzy_prior({
-            'normal': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-            'elevada': TriangularFuzzyProbability(0.3, 0.4, 0.5)
+            'normal': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+            'elevada': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5)
         })
         
         self.nodes['deformacion'].set_fuzzy_prior({
-            'nula': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-            'leve': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-            'significativa': TriangularFuzzyProbability(0.1, 0.2, 0.3)
+            'nula': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+            'leve': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+            'significativa': TriangularFuzzyProbability.intern(0.1, 0.2, 0.3)
         })
         
         self.nodes['historia'].set_fuzzy_prior({
-            'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'media': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-            'alta': TriangularFuzzyProbability(0.1, 0.2, 0.3)
+            'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'media': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+            'alta': TriangularFuzzyProbability.intern(0.1, 0.2, 0.3)
         })
         
         self.nodes['densidad'].set_fuzzy_prior({
-            'baja': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-            'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'alta': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+            'baja': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+            'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'alta': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
         })
         
         self.nodes['preparacion'].set_fuzzy_prior({
-            'muy bajo': TriangularFuzzyProbability(0.1, 0.2, 0.3),
-            'bajo': TriangularFuzzyProbability(0.2, 0.25, 0.3),
-            'medio': TriangularFuzzyProbability(0.2, 0.25, 0.3),
-            'alto': TriangularFuzzyProbability(0.15, 0.2, 0.25),
-            'muy alto': TriangularFuzzyProbability(0.05, 0.1, 0.15)
+            'muy bajo': TriangularFuzzyProbability.intern(0.1, 0.2, 0.3),
+            'bajo': TriangularFuzzyProbability.intern(0.2, 0.25, 0.3),
+            'medio': TriangularFuzzyProbability.intern(0.2, 0.25, 0.3),
+            'alto': TriangularFuzzyProbability.intern(0.15, 0.2, 0.25),
+            'muy alto': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15)
         })
         
         self.nodes['proximidad'].set_fuzzy_prior({
-            'lejana': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-            'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'cercana': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+            'lejana': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+            'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'cercana': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
         })
         
         self.nodes['evacuacion'].set_fuzzy_prior({
-            'inexistente': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-            'parcial': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'completo': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+            'inexistente': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+            'parcial': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'completo': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
         })
         
         # Distribuciones a priori para nodos intermedios (por si acaso)
         self.nodes['amenaza'].set_fuzzy_prior({
-            'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'alta': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+            'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'alta': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
         })
         
         self.nodes['vulnerabilidad'].set_fuzzy_prior({
-            'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'alta': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+            'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'alta': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
         })
         
         self.nodes['riesgo'].set_fuzzy_prior({
-            'bajo': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'medio': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-            'alto': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+            'bajo': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'medio': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+            'alto': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
         })
         
         # CPDs difusas para nodos hijos
@@ -122,74 +378,74 @@ class TrueFuzzyBayesianNetwork:
         fuzzy_rules = {
             # Combinaciones extremas
             ('alta', 'elevada', 'significativa', 'alta'): {
-                'baja': TriangularFuzzyProbability(0.0, 0.02, 0.05),
-                'media': TriangularFuzzyProbability(0.05, 0.1, 0.15),
-                'alta': TriangularFuzzyProbability(0.8, 0.88, 0.95)
+                'baja': TriangularFuzzyProbability.intern(0.0, 0.02, 0.05),
+                'media': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15),
+                'alta': TriangularFuzzyProbability.intern(0.8, 0.88, 0.95)
             },
             ('baja', 'normal', 'nula', 'baja'): {
-                'baja': TriangularFuzzyProbability(0.85, 0.9, 0.95),
-                'media': TriangularFuzzyProbability(0.05, 0.08, 0.1),
-                'alta': TriangularFuzzyProbability(0.0, 0.02, 0.05)
+                'baja': TriangularFuzzyProbability.intern(0.85, 0.9, 0.95),
+                'media': TriangularFuzzyProbability.intern(0.05, 0.08, 0.1),
+                'alta': TriangularFuzzyProbability.intern(0.0, 0.02, 0.05)
             },
             
             # Combinaciones con alta sismicidad
             ('alta', 'elevada', 'leve', 'media'): {
-                'baja': TriangularFuzzyProbability(0.1, 0.15, 0.2),
-                'media': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alta': TriangularFuzzyProbability(0.3, 0.35, 0.4)
+                'baja': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2),
+                'media': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alta': TriangularFuzzyProbability.intern(0.3, 0.35, 0.4)
             },
             ('alta', 'normal', 'significativa', 'alta'): {
-                'baja': TriangularFuzzyProbability(0.05, 0.1, 0.15),
-                'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                'alta': TriangularFuzzyProbability(0.4, 0.5, 0.6)
+                'baja': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15),
+                'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                'alta': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6)
             },
             
             # Combinaciones con media sismicidad
             ('media', 'elevada', 'significativa', 'alta'): {
-                'baja': TriangularFuzzyProbability(0.05, 0.1, 0.15),
-                'media': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alta': TriangularFuzzyProbability(0.3, 0.4, 0.5)
+                'baja': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15),
+                'media': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alta': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5)
             },
             ('media', 'normal', 'leve', 'media'): {
-                'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                'media': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'alta': TriangularFuzzyProbability(0.1, 0.15, 0.2)
+                'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                'media': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'alta': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2)
             },
             ('media', 'elevada', 'nula', 'baja'): {
-                'baja': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'media': TriangularFuzzyProbability(0.3, 0.35, 0.4),
-                'alta': TriangularFuzzyProbability(0.05, 0.1, 0.15)
+                'baja': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'media': TriangularFuzzyProbability.intern(0.3, 0.35, 0.4),
+                'alta': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15)
             },
             
             # Combinaciones con baja sismicidad pero otros factores altos
             ('baja', 'elevada', 'significativa', 'alta'): {
-                'baja': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-                'media': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alta': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+                'baja': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+                'media': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alta': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
             },
             ('baja', 'normal', 'significativa', 'alta'): {
-                'baja': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                'alta': TriangularFuzzyProbability(0.1, 0.15, 0.2)
+                'baja': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                'alta': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2)
             },
             
             # Casos intermedios adicionales
             ('alta', 'normal', 'leve', 'media'): {
-                'baja': TriangularFuzzyProbability(0.2, 0.25, 0.3),
-                'media': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'alta': TriangularFuzzyProbability(0.15, 0.2, 0.25)
+                'baja': TriangularFuzzyProbability.intern(0.2, 0.25, 0.3),
+                'media': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'alta': TriangularFuzzyProbability.intern(0.15, 0.2, 0.25)
             },
             ('media', 'elevada', 'leve', 'media'): {
-                'baja': TriangularFuzzyProbability(0.15, 0.2, 0.25),
-                'media': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'alta': TriangularFuzzyProbability(0.2, 0.25, 0.3)
+                'baja': TriangularFuzzyProbability.intern(0.15, 0.2, 0.25),
+                'media': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'alta': TriangularFuzzyProbability.intern(0.2, 0.25, 0.3)
             },
             
             # Caso especial: baja sismicidad pero gases elevados y deformación
             ('baja', 'elevada', 'leve', 'media'): {
-                'baja': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                'alta': TriangularFuzzyProbability(0.1, 0.15, 0.2)
+                'baja': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                'alta': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2)
             }
         }
         self.nodes['amenaza'].set_fuzzy_cpd(fuzzy_rules)
@@ -199,65 +455,65 @@ class TrueFuzzyBayesianNetwork:
         fuzzy_rules = {
             # Escenario peor caso: alta densidad, nula preparación, cercanía y sin evacuación
             ('alta', 'muy bajo', 'cercana', 'inexistente'): {
-                'baja': TriangularFuzzyProbability(0.0, 0.02, 0.05),
-                'media': TriangularFuzzyProbability(0.05, 0.1, 0.15),
-                'alta': TriangularFuzzyProbability(0.8, 0.88, 0.95)
+                'baja': TriangularFuzzyProbability.intern(0.0, 0.02, 0.05),
+                'media': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15),
+                'alta': TriangularFuzzyProbability.intern(0.8, 0.88, 0.95)
             },
             
             # Escenario mejor caso: baja densidad, máxima preparación, lejanía y evacuación completa
             ('baja', 'muy alto', 'lejana', 'completo'): {
-                'baja': TriangularFuzzyProbability(0.85, 0.9, 0.95),
-                'media': TriangularFuzzyProbability(0.05, 0.08, 0.12),
-                'alta': TriangularFuzzyProbability(0.0, 0.02, 0.05)
+                'baja': TriangularFuzzyProbability.intern(0.85, 0.9, 0.95),
+                'media': TriangularFuzzyProbability.intern(0.05, 0.08, 0.12),
+                'alta': TriangularFuzzyProbability.intern(0.0, 0.02, 0.05)
             },
             
             # Alta densidad pero buena preparación y evacuación
             ('alta', 'alto', 'cercana', 'completo'): {
-                'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                'media': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alta': TriangularFuzzyProbability(0.1, 0.15, 0.2)
+                'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                'media': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alta': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2)
             },
             
             # Densidad media con preparación media y evacuación parcial
             ('media', 'medio', 'media', 'parcial'): {
-                'baja': TriangularFuzzyProbability(0.25, 0.35, 0.45),
-                'media': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alta': TriangularFuzzyProbability(0.15, 0.2, 0.25)
+                'baja': TriangularFuzzyProbability.intern(0.25, 0.35, 0.45),
+                'media': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alta': TriangularFuzzyProbability.intern(0.15, 0.2, 0.25)
             },
             
             # Alta densidad con preparación media
             ('alta', 'medio', 'media', 'parcial'): {
-                'baja': TriangularFuzzyProbability(0.1, 0.15, 0.2),
-                'media': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alta': TriangularFuzzyProbability(0.3, 0.35, 0.4)
+                'baja': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2),
+                'media': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alta': TriangularFuzzyProbability.intern(0.3, 0.35, 0.4)
             },
             
             # Baja densidad pero mala preparación
             ('baja', 'bajo', 'lejana', 'inexistente'): {
-                'baja': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'media': TriangularFuzzyProbability(0.3, 0.35, 0.4),
-                'alta': TriangularFuzzyProbability(0.05, 0.1, 0.15)
+                'baja': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'media': TriangularFuzzyProbability.intern(0.3, 0.35, 0.4),
+                'alta': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15)
             },
             
             # Densidad media con preparación baja
             ('media', 'bajo', 'cercana', 'parcial'): {
-                'baja': TriangularFuzzyProbability(0.15, 0.2, 0.25),
-                'media': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'alta': TriangularFuzzyProbability(0.2, 0.25, 0.3)
+                'baja': TriangularFuzzyProbability.intern(0.15, 0.2, 0.25),
+                'media': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'alta': TriangularFuzzyProbability.intern(0.2, 0.25, 0.3)
             },
             
             # Todos los factores en nivel medio
             ('media', 'medio', 'media', 'parcial'): {
-                'baja': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-                'media': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'alta': TriangularFuzzyProbability(0.1, 0.15, 0.2)
+                'baja': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+                'media': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'alta': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2)
             },
             
             # Alta densidad pero lejanía compensatoria
             ('alta', 'medio', 'lejana', 'parcial'): {
-                'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                'media': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alta': TriangularFuzzyProbability(0.1, 0.15, 0.2)
+                'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                'media': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alta': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2)
             }
         }
         self.nodes['vulnerabilidad'].set_fuzzy_cpd(fuzzy_rules)
@@ -267,66 +523,66 @@ class TrueFuzzyBayesianNetwork:
         fuzzy_rules = {
             # Escenarios base
             ('baja', 'baja'): {
-                'bajo': TriangularFuzzyProbability(0.75, 0.85, 0.92),
-                'medio': TriangularFuzzyProbability(0.05, 0.1, 0.15),
-                'alto': TriangularFuzzyProbability(0.0, 0.03, 0.06)
+                'bajo': TriangularFuzzyProbability.intern(0.75, 0.85, 0.92),
+                'medio': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15),
+                'alto': TriangularFuzzyProbability.intern(0.0, 0.03, 0.06)
             },
             ('baja', 'media'): {
-                'bajo': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'medio': TriangularFuzzyProbability(0.25, 0.35, 0.45),
-                'alto': TriangularFuzzyProbability(0.05, 0.1, 0.15)
+                'bajo': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'medio': TriangularFuzzyProbability.intern(0.25, 0.35, 0.45),
+                'alto': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15)
             },
             ('baja', 'alta'): {
-                'bajo': TriangularFuzzyProbability(0.25, 0.35, 0.45),
-                'medio': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'alto': TriangularFuzzyProbability(0.15, 0.2, 0.25)
+                'bajo': TriangularFuzzyProbability.intern(0.25, 0.35, 0.45),
+                'medio': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'alto': TriangularFuzzyProbability.intern(0.15, 0.2, 0.25)
             },
             ('media', 'baja'): {
-                'bajo': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-                'medio': TriangularFuzzyProbability(0.35, 0.45, 0.55),
-                'alto': TriangularFuzzyProbability(0.05, 0.1, 0.15)
+                'bajo': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6),
+                'medio': TriangularFuzzyProbability.intern(0.35, 0.45, 0.55),
+                'alto': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15)
             },
             ('media', 'media'): {
-                'bajo': TriangularFuzzyProbability(0.15, 0.25, 0.35),
-                'medio': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'alto': TriangularFuzzyProbability(0.15, 0.25, 0.35)
+                'bajo': TriangularFuzzyProbability.intern(0.15, 0.25, 0.35),
+                'medio': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'alto': TriangularFuzzyProbability.intern(0.15, 0.25, 0.35)
             },
             ('media', 'alta'): {
-                'bajo': TriangularFuzzyProbability(0.05, 0.1, 0.15),
-                'medio': TriangularFuzzyProbability(0.35, 0.45, 0.55),
-                'alto': TriangularFuzzyProbability(0.4, 0.5, 0.6)
+                'bajo': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15),
+                'medio': TriangularFuzzyProbability.intern(0.35, 0.45, 0.55),
+                'alto': TriangularFuzzyProbability.intern(0.4, 0.5, 0.6)
             },
             ('alta', 'baja'): {
-                'bajo': TriangularFuzzyProbability(0.15, 0.25, 0.35),
-                'medio': TriangularFuzzyProbability(0.45, 0.55, 0.65),
-                'alto': TriangularFuzzyProbability(0.15, 0.25, 0.35)
+                'bajo': TriangularFuzzyProbability.intern(0.15, 0.25, 0.35),
+                'medio': TriangularFuzzyProbability.intern(0.45, 0.55, 0.65),
+                'alto': TriangularFuzzyProbability.intern(0.15, 0.25, 0.35)
             },
             ('alta', 'media'): {
-                'bajo': TriangularFuzzyProbability(0.05, 0.1, 0.15),
-                'medio': TriangularFuzzyProbability(0.25, 0.35, 0.45),
-                'alto': TriangularFuzzyProbability(0.5, 0.6, 0.7)
+                'bajo': TriangularFuzzyProbability.intern(0.05, 0.1, 0.15),
+                'medio': TriangularFuzzyProbability.intern(0.25, 0.35, 0.45),
+                'alto': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7)
             },
             ('alta', 'alta'): {
-                'bajo': TriangularFuzzyProbability(0.0, 0.02, 0.05),
-                'medio': TriangularFuzzyProbability(0.1, 0.15, 0.2),
-                'alto': TriangularFuzzyProbability(0.75, 0.85, 0.95)
+                'bajo': TriangularFuzzyProbability.intern(0.0, 0.02, 0.05),
+                'medio': TriangularFuzzyProbability.intern(0.1, 0.15, 0.2),
+                'alto': TriangularFuzzyProbability.intern(0.75, 0.85, 0.95)
             },
             
             # Casos especiales
             ('media-alta', 'baja'): {  # Transición entre media y alta amenaza
-                'bajo': TriangularFuzzyProbability(0.1, 0.2, 0.3),
-                'medio': TriangularFuzzyProbability(0.5, 0.6, 0.7),
-                'alto': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+                'bajo': TriangularFuzzyProbability.intern(0.1, 0.2, 0.3),
+                'medio': TriangularFuzzyProbability.intern(0.5, 0.6, 0.7),
+                'alto': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
             },
             ('alta', 'media-alta'): {  # Vulnerabilidad en transición
-                'bajo': TriangularFuzzyProbability(0.0, 0.05, 0.1),
-                'medio': TriangularFuzzyProbability(0.2, 0.3, 0.4),
-                'alto': TriangularFuzzyProbability(0.6, 0.7, 0.8)
+                'bajo': TriangularFuzzyProbability.intern(0.0, 0.05, 0.1),
+                'medio': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4),
+                'alto': TriangularFuzzyProbability.intern(0.6, 0.7, 0.8)
             },
             ('baja-media', 'alta'): {  # Amenaza en transición
-                'bajo': TriangularFuzzyProbability(0.15, 0.25, 0.35),
-                'medio': TriangularFuzzyProbability(0.45, 0.55, 0.65),
-                'alto': TriangularFuzzyProbability(0.2, 0.3, 0.4)
+                'bajo': TriangularFuzzyProbability.intern(0.15, 0.25, 0.35),
+                'medio': TriangularFuzzyProbability.intern(0.45, 0.55, 0.65),
+                'alto': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
             }
         }
         self.nodes['riesgo'].set_fuzzy_cpd(fuzzy_rules)
@@ -420,6 +676,10 @@ class TrueFuzzyBayesianNetwork:
         if variable not in self.fuzzy_systems:
             return 'medio'  # Estado por defecto
         
+        # Sin trazas, usar la tabla de puntos de quiebre precalculada
+        if not verbose:
+            return self.fuzzifier(variable).state_of(crisp_value)
+        
         ranges = self.fuzzy_systems[variable]['ranges']
         max_membership = -1  # Inicializar con valor negativo
         best_state = list(ranges.keys())[0]
@@ -465,36 +725,55 @@ class TrueFuzzyBayesianNetwork:
     
     def fuzzy_inference(self, evidence_crisp, target_variable='riesgo', verbose=False):
         """
-        Realizar inferencia difusa completa en la red
+        Realizar inferencia difusa en la red
+        
+        Solo se fuzzifican y se calculan los ancestros de los objetivos: una consulta
+        sobre 'amenaza' no recorre la mitad de vulnerabilidad de la red.
+        
+        Las variables de entrada ausentes (o NaN) se marginalizan sobre sus
+        distribuciones a priori (ver `marginal_table`).
         
         Args:
             evidence_crisp: Diccionario con evidencia en valores crisp
-            target_variable: Variable objetivo para la inferencia
+            target_variable: Variable objetivo para la inferencia, o lista de variables
+                             objetivo calculadas en una sola pasada
             verbose: Si mostrar información detallada
             
         Returns:
-            Distribución difusa para la variable objetivo
+            Distribución difusa para la variable objetivo; con una lista de objetivos,
+            diccionario objetivo -> distribución
         """
+        stats = self.instrumentation
+        if stats is not None:
+            start = perf_counter_ns()
+        
         # Validación de entrada
         if not evidence_crisp or not isinstance(evidence_crisp, dict):
             raise ValueError("evidence_crisp debe ser un diccionario no vacío")
         
-        if target_variable not in self.nodes:
-            raise ValueError(f"Variable objetivo '{target_variable}' no existe en la red")
+        targets = (target_variable,) if isinstance(target_variable, str) else tuple(target_variable)
+        for target in targets:
+            if target not in self.nodes:
+                raise ValueError(f"Variable objetivo '{target}' no existe en la red")
         
         # Validar que los valores sean numéricos
         for var, value in evidence_crisp.items():
             if not isinstance(value, (int, float)):
                 raise TypeError(f"El valor para '{var}' debe ser numérico, recibido: {type(value)}")
+        
+        if stats is not None:
+            start = stats.lap('validation', start)
                 
         if verbose:
             print("🌋 INICIANDO INFERENCIA DIFUSA BAYESIANA")
             print("=" * 50)
         
-        # Paso 1: Convertir evidencia crisp a estados lingüísticos
+        # Paso 1: Convertir a estados lingüísticos la evidencia de la que dependen los objetivos
+        plan = self.execution_plan()
+        inputs = plan.inputs(targets)
         evidence_linguistic = {}
         for var, value in evidence_crisp.items():
-            if var in self.fuzzy_systems:
+            if var in self.fuzzy_systems and var in inputs and value == value:  # NaN: sin lectura
                 state = self.crisp_to_fuzzy_state(var, value, verbose)
                 evidence_linguistic[var] = state
                 if verbose:
@@ -503,150 +782,605 @@ class TrueFuzzyBayesianNetwork:
         if verbose:
             print(f"\n🔍 Evidencia lingüística: {evidence_linguistic}")
         
+        if stats is not None:
+            start = stats.lap('fuzzification', start)
+        trace = self.trace
+        if trace is not None:
+            trace.append(self._trace_record(evidence_crisp, evidence_linguistic, targets))
+        
+        # El resultado solo depende de los estados lingüísticos: consultar la caché, que
+        # guarda junto al resultado las reglas usadas para contarlas también en los aciertos
+        cache = self.inference_cache if not verbose else None
+        rules = None
+        if cache is not None:
+            cache_key = (target_variable if isinstance(target_variable, str) else targets,) + tuple(
+                evidence_linguistic.get(var) for var in inputs)
+            entry = cache.get(cache_key)
+            if stats is not None:
+                start = stats.lap('cache_lookup', start)
+                stats.record_query(entry is not None)
+            if entry is not None:
+                result, rules = entry
+                if stats is not None:
+                    for rule in rules:
+                        stats.record_rule(*rule)
+                return result
+            rules = []
+        elif stats is not None:
+            stats.record_query(False)
+        
         # Paso 2: Realizar inferencia difusa hacia adelante
-        inferred_states = self._forward_fuzzy_inference(evidence_linguistic, verbose)
+        inferred_states = self._forward_fuzzy_inference(evidence_linguistic, verbose, targets, rules)
+        if stats is not None:
+            start = stats.lap('forward', start)
         
-        # Paso 3: Obtener distribución difusa final
-        if target_variable in inferred_states:
-            result = inferred_states[target_variable]
-        else:
-            # Si no se pudo inferir, usar distribución a priori
-            result = self.nodes[target_variable].fuzzy_prior if target_variable in self.nodes else {}
+        # Paso 3: Obtener distribución difusa final (a priori para un nodo raíz)
+        results = {target: inferred_states[target] if target in inferred_states else self.nodes[target].fuzzy_prior
+                   for target in targets}
+        result = results[target_variable] if isinstance(target_variable, str) else results
+        
+        if cache is not None:
+            cache.put(cache_key, (result, tuple(rules)))
+        if stats is not None:
+            stats.lap('result', start)
         
         if verbose:
-            print(f"\n🎯 RESULTADO FINAL para '{target_variable}':")
-            for state, fuzzy_prob in result.items():
-                crisp_val = fuzzy_prob.defuzzify_centroid()
-                print(f"   {state}: {fuzzy_prob} → crisp: {crisp_val:.3f}")
+            for target, distribution in results.items():
+                print(f"\n🎯 RESULTADO FINAL para '{target}':")
+                for state, fuzzy_prob in distribution.items():
+                    crisp_val = fuzzy_prob.defuzzify_centroid()
+                    print(f"   {state}: {fuzzy_prob} → crisp: {crisp_val:.3f}")
         
         return result
     
-    def _forward_fuzzy_inference(self, evidence_linguistic, verbose=False):
-        """Inferencia difusa hacia adelante usando propagación de creencias difusas"""
-        inferred = evidence_linguistic.copy()
+    @property
+    def input_variables(self):
+        """Variables de entrada (nodos raíz) en el orden de las columnas del modo por lotes"""
+        return [name for name, node in self.nodes.items() if not node.parents]
+    
+    def fuzzy_inference_batch(self, evidence_batch, alpha_levels=None, soft=False, target_variable='riesgo'):
+        """
+        Realizar inferencia difusa vectorizada sobre un lote de evidencias crisp
         
-        # Inferir amenaza si tenemos sus padres
-        amenaza_parents = ['sismicidad', 'gases', 'deformacion', 'historia']
-        if all(parent in inferred for parent in amenaza_parents):
-            parent_states = tuple(inferred[parent] for parent in amenaza_parents)
+        Args:
+            evidence_batch: Arreglo (N, 8) con columnas en el orden de `input_variables`
+                            o DataFrame con una columna por variable de entrada (basta
+                            con las variables de las que dependen los objetivos)
+            alpha_levels: Número de niveles alfa (o arreglo de niveles) para propagar
+                          cortes alfa en lugar de triángulos (ver `alpha_risk_table`)
+            soft: Propagar los vectores de membresía completos en lugar del estado
+                  ganador de cada variable (ver `_soft_inference_batch`)
+            target_variable: Nodo objetivo o lista de nodos objetivo; solo se calculan
+                             sus ancestros
             
-            if verbose:
-                print(f"🔍 Evaluando amenaza con padres: {parent_states}")
-                
-            if parent_states in self.nodes['amenaza'].fuzzy_cpd:
-                inferred_amenaza = self.nodes['amenaza'].fuzzy_cpd[parent_states]
-                if verbose:
-                    print(f"\n⚡ Inferencia de AMENAZA:")
-                    print(f"   Padres: {parent_states}")
-                    for state, prob in inferred_amenaza.items():
-                        print(f"   amenaza({state}): {prob}")
-                
-                # Seleccionar estado más probable (defuzzificación)
-                best_state = max(inferred_amenaza.keys(), 
-                               key=lambda s: inferred_amenaza[s].defuzzify_centroid())
-                inferred['amenaza'] = best_state
-            else:
-                # Usar interpolación difusa para casos no definidos
-                inferred_amenaza = self._interpolate_fuzzy_cpd('amenaza', parent_states)
-                if verbose:
-                    print(f"\n⚡ Inferencia de AMENAZA (interpolada):")
-                    print(f"   Padres: {parent_states}")
-                    for state, prob in inferred_amenaza.items():
-                        print(f"   amenaza({state}): {prob}")
-                
-                best_state = max(inferred_amenaza.keys(), 
-                               key=lambda s: inferred_amenaza[s].defuzzify_centroid())
-                inferred['amenaza'] = best_state
+        Returns:
+            Tupla (distribuciones, riesgo_crisp): arreglo (N, estados, 3) con los (a, m, b)
+            del objetivo y arreglo (N,) con el valor defuzzificado por centroide.
+            Los resultados coinciden exactamente con `fuzzy_inference` fila a fila.
+            Con una lista de objetivos, diccionario objetivo -> tupla.
+            Con `alpha_levels`, tupla (distribuciones, riesgo) de AlphaCutArray con formas
+            (N, estados) y (N,); `riesgo.centroid()` da el valor crisp.
+            Los valores NaN son lecturas faltantes y se marginalizan sobre la a priori de
+            la variable (ver `marginal_table`).
+        """
+        targets = (target_variable,) if isinstance(target_variable, str) else tuple(target_variable)
+        plan = self.execution_plan()
+        for target in targets:
+            if target not in plan.kernels:
+                raise ValueError(f"Variable objetivo '{target}' no existe en la red o no tiene padres")
+        inputs = plan.inputs(targets)
+        variables = list(inputs) if hasattr(evidence_batch, 'columns') else self.input_variables
+        evidence = self._evidence_matrix(evidence_batch, variables)
+        columns = {var: evidence[:, j] for j, var in enumerate(variables) if var in inputs}
+        
+        # Lecturas faltantes (NaN): se marginalizan sobre la distribución a priori
+        missing = {}
+        for var, values in columns.items():
+            mask = np.isnan(values)
+            if mask.any():
+                missing[var] = mask
+        
+        if soft:
+            if alpha_levels is not None:
+                raise ValueError("La evidencia blanda no se puede combinar con alpha_levels")
+            weights = {var: self._soft_evidence_weights(var, values) for var, values in columns.items()}
+            for var, mask in missing.items():
+                weights[var][mask] = self._prior_weights(var)
+            distributions = self._soft_inference_batch(weights, targets)
+            results = {target: (distributions[target], self._defuzzify_batch(target, distributions[target]))
+                       for target in targets}
+            return results[target_variable] if isinstance(target_variable, str) else results
+        
+        # Paso 1: Convertir cada columna crisp a códigos de estado lingüístico
+        codes = {var: self.fuzzifier(var).codes(values) for var, values in columns.items()}
+        
+        if alpha_levels is not None:
+            if targets != ('riesgo',):
+                raise ValueError("Los cortes alfa solo están disponibles para 'riesgo'")
+            if missing:
+                raise ValueError("Los cortes alfa requieren evidencia completa (sin NaN)")
+            return self._alpha_inference_batch(codes, alpha_levels)
+        
+        # Con la tabla precalculada la inferencia es un único índice
+        if self.precompute and targets == ('riesgo',):
+            if self.risk_table is None:
+                self.precompute_risk_table()
+            index = tuple(codes[var] for var in inputs)
+            results = {'riesgo': (self.risk_table[index], self.risk_table_crisp[index])}
+        else:
+            # Paso 2: Inferencia hacia adelante y defuzzificación por centroide
+            distributions = plan.run_batch(codes, targets)
+            results = {target: (distributions[target], self._defuzzify_batch(target, distributions[target]))
+                       for target in targets}
+        
+        if missing:
+            for target, (target_distributions, crisp) in results.items():
+                self._fill_missing(target, target_distributions, crisp, codes, missing)
+        return results[target_variable] if isinstance(target_variable, str) else results
+    
+    def precompute_risk_table(self):
+        """
+        Materializar la distribución de 'riesgo' y su valor crisp para cada combinación
+        de estados de las variables de entrada
+        
+        La tabla tiene forma (3, 2, 3, 3, 3, 5, 3, 3, estados, 3): 7 290 combinaciones
+        con 9 valores float64 cada una (~525 KB) más el valor crisp (~58 KB), en total
+        unos 570 KB. Tras construirla, `fuzzy_inference_batch` solo fuzzifica e indexa.
+        """
+        variables = self.execution_plan().inputs(('riesgo',))
+        shape = tuple(len(self.nodes[var].states) for var in variables)
+        grid = np.indices(shape)
+        codes = {var: grid[j] for j, var in enumerate(variables)}
+        
+        distributions = self._forward_fuzzy_inference_batch(codes)
+        crisp = self._defuzzify_batch('riesgo', distributions)
+        distributions.setflags(write=False)
+        crisp.setflags(write=False)
+        self.risk_table = distributions
+        self.risk_table_crisp = crisp
+    
+    def alpha_risk_table(self, levels=21):
+        """
+        Cortes alfa de la CPD de 'riesgo' y de su nivel de riesgo difuso para cada
+        combinación de estados de sus padres
+        
+        El nivel de riesgo es la media ponderada difusa de los valores de los estados
+        (bajo=2, medio=5, alto=8) con la distribución como pesos, calculada por el
+        principio de extensión en cada nivel (ver `AlphaCutArray.weighted_average`).
+        Las tablas se calculan una vez por juego de niveles y se invalidan al cambiar
+        una CPD.
+        
+        Returns:
+            Tupla (distribuciones, riesgo) de AlphaCutArray indexados por los códigos
+            de estado de (amenaza, vulnerabilidad), con formas (3, 3, estados) y (3, 3):
+            27 números difusos de la CPD y 9 niveles de riesgo
+        """
+        alphas = AlphaCutArray.levels(levels) if np.ndim(levels) == 0 else np.asarray(levels, dtype=np.float64)
+        key = tuple(alphas.tolist())
+        tables = self.alpha_tables.get(key)
+        if tables is None:
+            node = self.compiled_node('riesgo')
+            distributions = AlphaCutArray.from_triangular(node.cpd_tensor, alphas)
+            values = [self._state_to_numeric(state) for state in node.states]
+            risk = distributions.weighted_average(values)
+            distributions.intervals.setflags(write=False)
+            risk.intervals.setflags(write=False)
+            tables = (distributions, risk)
+            self.alpha_tables[key] = tables
+        return tables
+    
+    def _alpha_inference_batch(self, codes, levels):
+        """Inferencia por lotes con cortes alfa: índices sobre `alpha_risk_table`"""
+        distributions, risk = self.alpha_risk_table(levels)
+        codes = self.execution_plan().propagate(codes, ('riesgo',))
+        index = tuple(codes[parent] for parent in self.nodes['riesgo'].parents)
+        return distributions[index], risk[index]
+    
+    def marginal_table(self, target_variable, missing):
+        """
+        Distribución del objetivo marginalizando las raíces sin observar sobre sus a prioris
+        
+        Eliminación de variables sobre los factores del plan: los pesos a priori de cada
+        raíz sin observar (centroides normalizados de su distribución a priori), un
+        factor determinista por nodo intermedio (indicador de su estado más probable) y
+        la CPD compilada del objetivo. Las variables se eliminan de una en una en el
+        orden del plan (primero las raíces sin observar según el primer nodo que las usa,
+        después los nodos intermedios en orden topológico): cada paso solo multiplica los
+        factores que contienen la variable, así que el coste queda acotado por el tamaño
+        de la tabla resultante. La tabla se guarda en `marginal_tables`, de modo que una
+        consulta con evidencia incompleta es un índice, igual que una completa.
         
-        # Inferir vulnerabilidad si tenemos sus padres
-        vuln_parents = ['densidad', 'preparacion', 'proximidad', 'evacuacion']
-        if all(parent in inferred for parent in vuln_parents):
-            parent_states = tuple(inferred[parent] for parent in vuln_parents)
+        Args:
+            target_variable: Nodo con padres
+            missing: Raíces ancestro del objetivo sin evidencia
             
-            if verbose:
-                print(f"🔍 Evaluando vulnerabilidad con padres: {parent_states}")
-                
-            if parent_states in self.nodes['vulnerabilidad'].fuzzy_cpd:
-                inferred_vuln = self.nodes['vulnerabilidad'].fuzzy_cpd[parent_states]
-                if verbose:
-                    print(f"\n🛡️ Inferencia de VULNERABILIDAD:")
-                    print(f"   Padres: {parent_states}")
-                    for state, prob in inferred_vuln.items():
-                        print(f"   vulnerabilidad({state}): {prob}")
-                
-                best_state = max(inferred_vuln.keys(), 
-                               key=lambda s: inferred_vuln[s].defuzzify_centroid())
-                inferred['vulnerabilidad'] = best_state
+        Returns:
+            Tupla (distribuciones, crisp, observadas): tablas indexadas por los códigos de
+            estado de las raíces observadas, con formas (..., estados, 3) y (...)
+        """
+        key = (target_variable, tuple(missing))
+        tables = self.marginal_tables.get(key)
+        if tables is None:
+            plan = self.execution_plan()
+            steps = plan.steps((target_variable,))
+            inputs = plan.inputs((target_variable,))
+            observed = tuple(var for var in inputs if var not in missing)
+            
+            # Factores (ejes, arreglo) con un eje por nodo más los de estados y (a, m, b) del objetivo
+            factors = [((var,), self._prior_weights(var)) for var in missing]
+            for kernel in steps[:-1]:
+                factors.append((kernel.parents + (kernel.name,), np.eye(len(kernel.states))[kernel.best_state]))
+            target = steps[-1]
+            factors.append((target.parents + _TARGET_AXES, target.tensor))
+            
+            elimination = [parent for kernel in steps for parent in kernel.parents if parent in missing]
+            elimination = list(dict.fromkeys(elimination)) + [kernel.name for kernel in steps[:-1]]
+            for variable in elimination:
+                involved = [factor for factor in factors if variable in factor[0]]
+                factors = [factor for factor in factors if variable not in factor[0]]
+                kept = tuple(dict.fromkeys(axis for axes, _ in involved for axis in axes if axis != variable))
+                factors.append((kept, self._contract(involved, kept)))
+            distributions = self._contract(factors, observed + _TARGET_AXES)
+            
+            crisp = self._defuzzify_batch(target_variable, distributions)
+            distributions.setflags(write=False)
+            crisp.setflags(write=False)
+            tables = (distributions, crisp, observed)
+            self.marginal_tables[key] = tables
+        return tables
+    
+    def _contract(self, factors, output):
+        """Producto de factores (ejes, arreglo) sumando los ejes que no están en `output`"""
+        letters = dict(zip(_TARGET_AXES, 'yz'))
+        available = iter('abcdefghijklmnopqrstuvwxABCDEFGHIJKLMNOPQRSTUVWXYZ')
+        def subscript(axes):
+            return ''.join(letters[axis] if axis in letters else letters.setdefault(axis, next(available))
+                           for axis in axes)
+        expression = ','.join(subscript(axes) for axes, _ in factors) + '->' + subscript(output)
+        return self.contractions.einsum(expression, *(array for _, array in factors))
+    
+    def _prior_weights(self, variable):
+        """Pesos (estados,) de una raíz: centroides normalizados de su distribución a priori"""
+        node = self.nodes[variable]
+        if not node.fuzzy_prior:
+            return np.full(len(node.states), 1.0 / len(node.states))
+        centroids = np.array([node.fuzzy_prior[state].defuzzify_centroid() for state in node.states])
+        total = centroids.sum()
+        return centroids / total if total > 0 else np.full(len(node.states), 1.0 / len(node.states))
+    
+    def _fill_missing(self, target_variable, distributions, crisp, codes, missing):
+        """
+        Sustituir en el lote las filas con evidencia incompleta por su distribución marginal
+        
+        Las tablas marginales de cada patrón presente se copian en una tabla extendida
+        del objetivo en la que una lectura faltante es un código de estado más; así
+        todas las filas incompletas se resuelven con un único índice, sea cual sea la
+        mezcla de patrones del lote.
+        
+        Args:
+            missing: Diccionario raíz -> máscara (N,) de lecturas faltantes
+        """
+        inputs = self.execution_plan().inputs((target_variable,))
+        if not any(var in missing for var in inputs):
+            return
+        none_missing = np.zeros(len(crisp), dtype=bool)
+        masks = np.stack([missing.get(var, none_missing) for var in inputs], axis=1)
+        patterns = masks @ (1 << np.arange(len(inputs)))
+        
+        table, crisp_table, filled = self._partial_table(target_variable)
+        for pattern in np.unique(patterns).tolist():
+            if pattern and pattern not in filled:
+                absent = tuple(var for bit, var in enumerate(inputs) if pattern >> bit & 1)
+                marginal, marginal_crisp, _ = self.marginal_table(target_variable, absent)
+                region = tuple(len(self.nodes[var].states) if var in absent else slice(len(self.nodes[var].states))
+                               for var in inputs)
+                table[region] = marginal
+                crisp_table[region] = marginal_crisp
+                filled.add(pattern)
+        
+        rows = np.flatnonzero(patterns)
+        index = tuple(np.where(missing[var][rows], len(self.nodes[var].states), codes[var][rows])
+                      if var in missing else codes[var][rows] for var in inputs)
+        distributions[rows] = table[index]
+        crisp[rows] = crisp_table[index]
+    
+    def _partial_table(self, target_variable):
+        """Tabla extendida (estados + 1 por raíz) del objetivo, rellenada por `_fill_missing`"""
+        tables = self.partial_tables.get(target_variable)
+        if tables is None:
+            plan = self.execution_plan()
+            shape = tuple(len(self.nodes[var].states) + 1 for var in plan.inputs((target_variable,)))
+            states = len(self.nodes[target_variable].states)
+            tables = (np.zeros(shape + (states, 3)), np.zeros(shape), set())
+            self.partial_tables[target_variable] = tables
+        return tables
+    
+    def joint_table(self):
+        """
+        Tabla conjunta de pesos sobre las combinaciones de estados de las raíces (ver
+        `JointTable`), calculada una vez y descartada al cambiar una CPD o una a priori
+        """
+        joint = self.joint
+        if joint is None:
+            joint = JointTable(self)
+            self.joint = joint
+        return joint
+    
+    def most_probable_explanations(self, evidence, variables=None, k=5):
+        """
+        Inferencia diagnóstica: combinaciones de estados de las raíces más probables
+        dada la evidencia, p. ej. qué estados de la amenaza explican mejor un riesgo
+        alto con una vulnerabilidad conocida
+        
+        La evidencia sobre un nodo con padres pondera cada combinación de raíces por el
+        peso (centroide normalizado) de ese estado en la distribución del nodo; la
+        evidencia sobre una raíz fija su estado. Sobre la tabla conjunta precalculada
+        la consulta son unos productos de arreglos y un `argpartition`.
+        
+        Args:
+            evidence: Diccionario nodo -> estado lingüístico (o valor crisp para las
+                      raíces; NaN equivale a no tener lectura)
+            variables: Raíces sin evidencia a explicar (por defecto, todas); el resto
+                       de raíces sin evidencia se marginalizan
+            k: Número de explicaciones (al menos 1)
+            
+        Returns:
+            Lista de diccionarios {'states': {variable: estado}, 'probability': p},
+            de mayor a menor probabilidad a posteriori
+        """
+        codes = {}
+        for name, value in evidence.items():
+            if name not in self.nodes:
+                raise ValueError(f"Variable '{name}' no existe en la red")
+            states = self.nodes[name].states
+            if isinstance(value, str):
+                if value not in states:
+                    raise ValueError(f"Estado '{value}' inválido para '{name}'; estados: {states}")
+                codes[name] = states.index(value)
+            elif isinstance(value, (int, float)) and not self.nodes[name].parents:
+                if value == value:
+                    codes[name] = states.index(self.crisp_to_fuzzy_state(name, value))
             else:
-                # Usar interpolación difusa para casos no definidos
-                inferred_vuln = self._interpolate_fuzzy_cpd('vulnerabilidad', parent_states)
-                if verbose:
-                    print(f"\n🛡️ Inferencia de VULNERABILIDAD (interpolada):")
-                    print(f"   Padres: {parent_states}")
-                    for state, prob in inferred_vuln.items():
-                        print(f"   vulnerabilidad({state}): {prob}")
-                
-                best_state = max(inferred_vuln.keys(), 
-                               key=lambda s: inferred_vuln[s].defuzzify_centroid())
-                inferred['vulnerabilidad'] = best_state
+                raise TypeError(f"El valor para '{name}' debe ser un estado lingüístico, recibido: {type(value)}")
+        return self.joint_table().top_k(codes, variables, k)
+    
+    def _soft_evidence_weights(self, variable, values):
+        """
+        Pesos (N, estados) de una variable de entrada: su vector de membresía normalizado
+        
+        Los valores sin membresía en ningún rango (fuera del universo o NaN) toman todo
+        el peso en el estado que les asigna `crisp_to_fuzzy_state`.
+        """
+        codes, memberships = self.fuzzifier(variable).fuzzify(values)
+        total = memberships.sum(axis=-1, keepdims=True)
+        hard = np.eye(memberships.shape[-1])[codes]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, memberships / total, hard)
+    
+    def _soft_inference_batch(self, weights, targets=('riesgo',)):
+        """
+        Inferencia con evidencia blanda por contracción tensorial
+        
+        Cada nodo con padres recibe la mezcla de sus CPDs compiladas ponderada por los
+        pesos de los padres: sum_{p1..pk} w1[p1] ... wk[pk] CPD[p1, ..., pk], calculada
+        para todo el lote con un único `einsum` (sin recorrer las combinaciones de
+        estados de los padres). La mezcla de triángulos con pesos crisp es otro
+        triángulo, y los pesos que el nodo pasa a sus hijos son los centroides de su
+        distribución normalizados.
+        
+        Args:
+            weights: Diccionario variable de entrada -> pesos (N, estados)
+            targets: Nodos cuyas distribuciones se devuelven
+            
+        Returns:
+            Diccionario objetivo -> arreglo (N, estados, 3) con su distribución
+        """
+        weights = dict(weights)
+        distributions = {}
+        for kernel in self.execution_plan().steps(targets):
+            letters = 'abcdefghijklmopqrstuvwxyz'[:len(kernel.parents)]
+            subscripts = ','.join(f'n{letter}' for letter in letters) + f',{letters}SV->nSV'
+            operands = [weights[parent] for parent in kernel.parents] + [kernel.tensor]
+            distributions[kernel.name] = distribution = self.contractions.einsum(subscripts, *operands)
+            
+            centroids = TriangularFuzzyArray.from_stacked(distribution).centroid()
+            total = centroids.sum(axis=-1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                weights[kernel.name] = np.where(total > 0, centroids / total, 1.0 / centroids.shape[-1])
+        return distributions
+    
+    def _forward_fuzzy_inference_batch(self, codes):
+        """Versión vectorizada de `_forward_fuzzy_inference` sobre códigos de estado"""
+        return self.execution_plan().run_batch(codes, ('riesgo',))['riesgo']
+    
+    def _evidence_matrix(self, evidence_batch, variables):
+        """Validar y convertir la evidencia por lotes a una matriz (N, variables) de float64"""
+        if hasattr(evidence_batch, 'columns'):
+            missing = [var for var in variables if var not in evidence_batch.columns]
+            if missing:
+                raise ValueError(f"Faltan columnas de evidencia: {missing}")
+            evidence_batch = evidence_batch[variables].to_numpy()
+        
+        evidence = np.asarray(evidence_batch)
+        if evidence.dtype.kind not in 'biuf':
+            raise TypeError(f"La evidencia por lotes debe ser numérica, recibido: {evidence.dtype}")
+        if evidence.ndim == 1:
+            evidence = evidence.reshape(1, -1)
+        if evidence.ndim != 2 or evidence.shape[1] != len(variables):
+            raise ValueError(f"La evidencia por lotes debe tener forma (N, {len(variables)}), "
+                             f"recibido: {evidence.shape}")
+        return evidence.astype(np.float64, copy=False)
+    
+    def fuzzifier(self, variable):
+        """
+        Obtener el fuzzificador vectorizado (FuzzyPartition) de una variable
+        
+        Se construye una sola vez a partir de `fuzzy_systems[variable]`; si se modifican
+        los rangos hay que descartarlo con `self.fuzzifiers.pop(variable)`.
+        """
+        partition = self.fuzzifiers.get(variable)
+        if partition is None:
+            system = self.fuzzy_systems[variable]
+            states = self.nodes[variable].states if variable in self.nodes else None
+            partition = FuzzyPartition(system['ranges'], system['universe'], states)
+            self.fuzzifiers[variable] = partition
+        return partition
+    
+    def _defuzzify_batch(self, node_name, distributions):
+        """Versión vectorizada de `defuzzify_distribution` con el método del centroide"""
+        weights = TriangularFuzzyArray.from_stacked(distributions).centroid()
+        total_weight = np.zeros(weights.shape[:-1])
+        weighted_sum = np.zeros(weights.shape[:-1])
+        
+        # Acumular en el mismo orden que la versión escalar para obtener resultados idénticos
+        for code, state in enumerate(self.nodes[node_name].states):
+            weight = weights[..., code]
+            total_weight = total_weight + weight
+            weighted_sum = weighted_sum + self._state_to_numeric(state) * weight
         
-        # Inferir riesgo si tenemos amenaza y vulnerabilidad
-        if 'amenaza' in inferred and 'vulnerabilidad' in inferred:
-            parent_states = (inferred['amenaza'], inferred['vulnerabilidad'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total_weight > 0, weighted_sum / total_weight, 5.0)
+    
+    def _forward_fuzzy_inference(self, evidence_linguistic, verbose=False, targets=None, rules=None):
+        """
+        Inferencia difusa hacia adelante usando propagación de creencias difusas
+        
+        Recorre los nodos con padres en el orden topológico del plan de ejecución: cada
+        nodo cuyos padres tienen estado toma la regla exacta (o su interpolación) y pasa
+        a sus hijos el estado de mayor centroide. Con `targets` solo se recorren los
+        ancestros de los objetivos. Los objetivos a los que les falta evidencia se
+        obtienen de `marginal_table`. Devuelve la distribución de cada nodo inferido y,
+        si se pasa la lista `rules`, le añade las tuplas (nodo, exacta, similitud) de las
+        reglas usadas.
+        """
+        stats = self.instrumentation
+        inferred = evidence_linguistic.copy()
+        distributions = {}
+        
+        plan = self.execution_plan()
+        for kernel in (plan.kernels.values() if targets is None else plan.steps(targets)):
+            name = kernel.name
+            if not all(parent in inferred for parent in kernel.parents):
+                continue
+            parent_states = tuple(inferred[parent] for parent in kernel.parents)
             
             if verbose:
-                print(f"🔍 Evaluando riesgo con padres: {parent_states}")
-                
-            if parent_states in self.nodes['riesgo'].fuzzy_cpd:
-                riesgo_distribution = self.nodes['riesgo'].fuzzy_cpd[parent_states]
-                if verbose:
-                    print(f"\n🔥 Inferencia de RIESGO:")
-                    print(f"   Padres: {parent_states}")
-                
-                return {'riesgo': riesgo_distribution}
+                print(f"🔍 Evaluando {name} con padres: {parent_states}")
+            
+            distribution, best_state, similarity = kernel.lookup(parent_states)
+            exact = similarity == len(parent_states)
+            if stats is not None:
+                stats.record_rule(name, exact, similarity)
+            if rules is not None:
+                rules.append((name, exact, similarity))
+            if verbose:
+                print(f"\n⚡ Inferencia de {name.upper()}{'' if exact else ' (interpolada)'}:")
+                print(f"   Padres: {parent_states}")
+                for state, prob in distribution.items():
+                    print(f"   {name}({state}): {prob}")
+            
+            # Estado más probable (defuzzificación), usado como evidencia de los hijos
+            inferred[name] = best_state
+            distributions[name] = distribution
+        
+        # Objetivos con evidencia incompleta: marginalizar las raíces sin observar
+        for target in (plan.kernels if targets is None else targets):
+            if target in distributions or target not in plan.kernels:
+                continue
+            missing = tuple(var for var in plan.inputs((target,)) if var not in evidence_linguistic)
+            table, _, observed = self.marginal_table(target, missing)
+            if verbose:
+                print(f"\n🔍 Marginalizando {target} sobre las a prioris de: {missing}")
+            index = tuple(self.nodes[var].states.index(evidence_linguistic[var]) for var in observed)
+            distributions[target] = {state: TriangularFuzzyProbability.intern(*values)
+                                     for state, values in zip(self.nodes[target].states, table[index].tolist())}
+        return distributions
+    
+    def compile_fuzzy_cpds(self):
+        """
+        Compilar las CPDs difusas de todos los nodos con padres en tensores densos
+        
+        Cada tensor se indexa con los códigos enteros de los estados de los padres,
+        p. ej. forma (3, 2, 3, 3, 3, 3) para 'amenaza'. Las combinaciones sin regla
+        se interpolan aquí una sola vez, de modo que una consulta es un único índice.
+        """
+        for node_name, node in self.nodes.items():
+            if node.parents:
+                self.compiled_node(node_name)
+    
+    def compiled_node(self, node_name):
+        """Obtener el nodo con su CPD compilada, compilándola si es necesario"""
+        node = self.nodes[node_name]
+        if not node.is_compiled:
+            self._compile_fuzzy_cpd(node)
+        return node
+    
+    def _compile_fuzzy_cpd(self, node):
+        """Materializar la CPD difusa (exacta o interpolada) de cada combinación de padres"""
+        parent_states = [self.nodes[parent].states for parent in node.parents]
+        shape = tuple(len(states) for states in parent_states)
+        tensor = np.empty(shape + (len(node.states), 3))
+        similarity = np.empty(shape, dtype=np.int8)
+        interpolated = {}
+        
+        for combination in np.ndindex(*shape):
+            key = tuple(states[code] for states, code in zip(parent_states, combination))
+            if key in node.fuzzy_cpd:
+                distribution = node.fuzzy_cpd[key]
+                similarity[combination] = len(key)
             else:
-                # Usar interpolación difusa para casos no definidos
-                riesgo_distribution = self._interpolate_fuzzy_cpd('riesgo', parent_states)
-                if verbose:
-                    print(f"\n🔥 Inferencia de RIESGO (interpolada):")
-                    print(f"   Padres: {parent_states}")
-                
-                return {'riesgo': riesgo_distribution}
+                distribution, similarity[combination] = self._closest_fuzzy_rule(node.name, key)
+                interpolated[key] = distribution
+            tensor[combination] = [[distribution[state].a, distribution[state].m, distribution[state].b]
+                                   for state in node.states]
+        
+        # Estado más probable: primer máximo del centroide, igual que `max` en la versión escalar
+        best_state = np.argmax(TriangularFuzzyArray.from_stacked(tensor).centroid(), axis=-1)
         
-        # Si no podemos inferir riesgo, usar distribución por defecto normalizada
-        return {'riesgo': {
-            'bajo': TriangularFuzzyProbability(0.4, 0.5, 0.6),
-            'medio': TriangularFuzzyProbability(0.25, 0.35, 0.45),
-            'alto': TriangularFuzzyProbability(0.15, 0.25, 0.35)
-        }}
+        for array in (tensor, similarity, best_state):
+            array.setflags(write=False)
+        node.cpd_tensor = tensor
+        node.cpd_similarity = similarity
+        node.cpd_best_state = best_state
+        node.interpolated_cpd = interpolated
     
     def _interpolate_fuzzy_cpd(self, node_name, parent_states):
         """Interpolar CPD difusa para combinaciones no definidas"""
         if node_name not in self.nodes:
             return {}
         
+        # Usar la interpolación materializada al compilar la CPD
+        interpolated = self.compiled_node(node_name).interpolated_cpd
+        if parent_states in interpolated:
+            return interpolated[parent_states]
+        
+        distribution, _ = self._closest_fuzzy_rule(node_name, parent_states)
+        return distribution
+    
+    def _closest_fuzzy_rule(self, node_name, parent_states):
+        """Interpolar la CPD a partir de la regla más similar; devuelve (distribución, similitud)"""
         node = self.nodes[node_name]
         
         # Si no hay CPD definida, usar distribución por defecto
         if not node.fuzzy_cpd:
             if node_name == 'amenaza':
                 return {
-                    'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                    'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                    'alta': TriangularFuzzyProbability(0.2, 0.3, 0.4)
-                }
+                    'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                    'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                    'alta': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
+                }, 0
             elif node_name == 'vulnerabilidad':
                 return {
-                    'baja': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                    'media': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                    'alta': TriangularFuzzyProbability(0.2, 0.3, 0.4)
-                }
+                    'baja': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                    'media': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                    'alta': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
+                }, 0
             elif node_name == 'riesgo':
                 return {
-                    'bajo': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                    'medio': TriangularFuzzyProbability(0.3, 0.4, 0.5),
-                    'alto': TriangularFuzzyProbability(0.2, 0.3, 0.4)
-                }
+                    'bajo': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                    'medio': TriangularFuzzyProbability.intern(0.3, 0.4, 0.5),
+                    'alto': TriangularFuzzyProbability.intern(0.2, 0.3, 0.4)
+                }, 0
         
         # Buscar la regla más similar y usar interpolación simple
         best_match = None
@@ -666,10 +1400,10 @@ class TrueFuzzyBayesianNetwork:
                 # Añadir ligera incertidumbre a la interpolación
                 a, m, b = fuzzy_num.a, fuzzy_num.m, fuzzy_num.b
                 # Expandir ligeramente el triángulo para reflejar incertidumbre
-                interpolated[state] = TriangularFuzzyProbability(
+                interpolated[state] = TriangularFuzzyProbability.intern(
                     max(0, a - 0.05), m, min(1, b + 0.05)
                 )
-            return interpolated
+            return interpolated, best_similarity
         
         # Si no hay reglas similares, usar distribución uniforme difusa
         num_states = len(node.states)
@@ -677,13 +1411,13 @@ class TrueFuzzyBayesianNetwork:
         
         result = {}
         for state in node.states:
-            result[state] = TriangularFuzzyProbability(
+            result[state] = TriangularFuzzyProbability.intern(
                 max(0, uniform_prob - 0.1),
                 uniform_prob,
                 min(1, uniform_prob + 0.1)
             )
         
-        return result
+        return result, 0
     
     def _normalize_fuzzy_distribution(self, fuzzy_distribution):
         """Normalizar una distribución difusa para que sume aproximadamente 1.0"""
@@ -701,11 +1435,7 @@ class TrueFuzzyBayesianNetwork:
         normalized = {}
         for state, fuzzy_num in fuzzy_distribution.items():
             factor = fuzzy_num.defuzzify_centroid() / total_centroid
-            normalized[state] = TriangularFuzzyProbability(
-                fuzzy_num.a * factor,
-                fuzzy_num.m * factor, 
-                fuzzy_num.b * factor
-            )
+            normalized[state] = fuzzy_num.scale(factor)
         
         return normalized
     
@@ -720,6 +1450,10 @@ class TrueFuzzyBayesianNetwork:
         Returns:
             Valor crisp defuzzificado
         """
+        stats = self.instrumentation
+        if stats is not None:
+            start = perf_counter_ns()
+        
         # Verificar que la distribución no esté vacía
         if not fuzzy_distribution:
             return 5.0  # Valor por defecto
@@ -736,7 +1470,10 @@ class TrueFuzzyBayesianNetwork:
                 total_weight += weight
                 weighted_sum += state_value * weight
             
-            return weighted_sum / total_weight if total_weight > 0 else 5.0
+            crisp_value = weighted_sum / total_weight if total_weight > 0 else 5.0
+            if stats is not None:
+                stats.lap('defuzzification', start)
+            return crisp_value
         
         elif method == 'mean_of_max':
             if not fuzzy_distribution.values():
@@ -748,7 +1485,10 @@ class TrueFuzzyBayesianNetwork:
                          if prob.defuzzify_centroid() == max_prob.defuzzify_centroid()]
             
             # Promedio de estados con máxima probabilidad
-            return np.mean([self._state_to_numeric(state) for state in max_states])
+            crisp_value = np.mean([self._state_to_numeric(state) for state in max_states])
+            if stats is not None:
+                stats.lap('defuzzification', start)
+            return crisp_value
         
         return 5.0  # Valor por defecto
     
@@ -782,9 +1522,9 @@ class TrueFuzzyBayesianNetwork:
             if not node.parents and not node.fuzzy_prior:
                 issues.append(f"Nodo raíz '{node_name}' no tiene distribución a priori")
         
-        # Verificar sistemas difusos
-        for var_name in self.nodes.keys():
-            if var_name not in self.fuzzy_systems:
+        # Verificar sistemas difusos de las variables de entrada (nodos raíz)
+        for var_name, node in self.nodes.items():
+            if not node.parents and var_name not in self.fuzzy_systems:
                 issues.append(f"Variable '{var_name}' no tiene sistema difuso definido")
         
         return issues
@@ -802,7 +1542,7 @@ class TrueFuzzyBayesianNetwork:
         for node_name, node in self.nodes.items():
             if not node.parents:
                 info['root_nodes'].append(node_name)
-            elif node_name in ['amenaza', 'vulnerabilidad']:
+            elif any(node_name in other.parents for other in self.nodes.values()):
                 info['intermediate_nodes'].append(node_name)
             else:
                 info['leaf_nodes'].append(node_name)
@@ -810,4 +1550,14 @@ class TrueFuzzyBayesianNetwork:
             if node.fuzzy_cpd:
                 info['total_cpd_rules'] += len(node.fuzzy_cpd)
         
-        return info
\ No newline at end of file
+        return info
+
+
+_TARGET_AXES = (('objetivo', 'estados'), ('objetivo', 'abm'))  # Ejes de las CPDs ajenos a los nodos
+
+
+def _read_only(array):
+    """Copia de solo lectura de un arreglo"""
+    array = np.array(array)
+    array.setflags(write=False)
+    return array
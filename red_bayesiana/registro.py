@@ -0,0 +1,142 @@
+# Registro de distritos con la parte estática de la red evaluada una sola vez
+import numpy as np
+
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+
+
+class DistrictRegistry:
+    """
+    Registro de distritos para reevaluar el riesgo ante nuevas lecturas del volcán
+
+    Las variables estáticas de cada distrito (densidad, preparación, proximidad,
+    evacuación e historia) se fuzzifican al registrarlo, y los nodos intermedios que
+    solo dependen de ellas ('vulnerabilidad') se infieren y guardan una sola vez.
+    Cada lectura de las variables dinámicas se fuzzifica una vez y se propaga por el
+    plan de ejecución de la red hasta el objetivo, con índices sobre las tablas
+    compiladas para todos los distritos a la vez.
+    """
+
+    def __init__(self, network=None, dynamic_variables=('sismicidad', 'gases', 'deformacion'),
+                 target_variable='riesgo', bounds=None):
+        """
+        Args:
+            network: Red a usar (por defecto, `TrueFuzzyBayesianNetwork.shared()`)
+            dynamic_variables: Variables que cambian con la actividad volcánica
+            target_variable: Nodo cuyo riesgo se evalúa
+            bounds: Diccionario opcional variable -> (mínimo, máximo) para recortar valores
+
+        Raises:
+            ValueError: Si el objetivo no existe en la red o no tiene padres
+        """
+        self.network = network if network is not None else TrueFuzzyBayesianNetwork.shared()
+        if target_variable not in self.network.execution_plan().kernels:
+            raise ValueError(f"Variable objetivo '{target_variable}' no existe en la red o no tiene padres")
+        self.dynamic_variables = list(dynamic_variables)
+        self.static_variables = [var for var in self.network.input_variables
+                                 if var not in self.dynamic_variables]
+        self.target_variable = target_variable
+        self.bounds = dict(bounds or {})
+        self.names = []
+        self._static_values = {var: [] for var in self.static_variables}
+        self._static_codes = None
+        self._cached_codes = None
+        self._target_crisp = None
+        self._plan = None
+
+    def register(self, name, data):
+        """Registrar (o actualizar) un distrito con sus valores crisp estáticos"""
+        missing = [var for var in self.static_variables if var not in data]
+        if missing:
+            raise ValueError(f"Faltan variables estáticas para '{name}': {missing}")
+
+        if name in self.names:
+            index = self.names.index(name)
+            for var in self.static_variables:
+                self._static_values[var][index] = float(self._clip(var, data[var]))
+        else:
+            self.names.append(name)
+            for var in self.static_variables:
+                self._static_values[var].append(float(self._clip(var, data[var])))
+        self._static_codes = None
+
+    def register_many(self, districts):
+        """Registrar varios distritos a partir de un diccionario nombre -> datos"""
+        for name, data in districts.items():
+            self.register(name, data)
+
+    def _clip(self, variable, value):
+        """Recortar un valor o arreglo crisp a los límites configurados para la variable"""
+        value = np.asarray(value, dtype=np.float64)
+        if variable in self.bounds:
+            value = np.clip(value, *self.bounds[variable])
+        return value
+
+    def _prepare(self):
+        """
+        Fuzzificar las variables estáticas e inferir los nodos que solo dependen de ellas
+
+        Returns:
+            Núcleos del plan de ejecución hasta el objetivo, en orden topológico
+        """
+        network = self.network
+        plan = network.execution_plan()
+        steps = plan.steps((self.target_variable,))
+
+        # Rehacer lo cacheado si hay distritos nuevos o si la red descartó su plan (cambió una CPD)
+        if self._static_codes is not None and self._plan is plan:
+            return steps
+        self._plan = plan
+        self._target_crisp = network._defuzzify_batch(self.target_variable, steps[-1].tensor)
+        static_codes = {var: network.fuzzifier(var).codes(np.array(values))
+                        for var, values in self._static_values.items()}
+        cached_codes = {}
+        for kernel in steps[:-1]:
+            if all(parent in static_codes or parent in cached_codes for parent in kernel.parents):
+                cached_codes[kernel.name] = kernel.best({**static_codes, **cached_codes})
+
+        self._static_codes = static_codes
+        self._cached_codes = cached_codes
+        return steps
+
+    def evaluate(self, reading, districts=None):
+        """
+        Reevaluar todos los distritos frente a una lectura de las variables dinámicas
+
+        Args:
+            reading: Diccionario variable dinámica -> valor crisp o arreglo (R,) de lecturas
+            districts: Nombres de los distritos a evaluar (por defecto, todos)
+
+        Returns:
+            Tupla (distribuciones, riesgo_crisp) con formas (..., D, estados, 3) y (..., D),
+            donde D es el número de distritos en el orden de `names` (o de `districts`)
+        """
+        if not self.names:
+            raise ValueError("No hay distritos registrados")
+        missing = [var for var in self.dynamic_variables if var not in reading]
+        if missing:
+            raise ValueError(f"Faltan variables dinámicas en la lectura: {missing}")
+        steps = self._prepare()
+
+        network = self.network
+        codes = {**self._static_codes, **self._cached_codes}
+        if districts is not None:
+            selection = np.array([self.names.index(name) for name in districts], dtype=np.intp)
+            codes = {var: var_codes[selection] for var, var_codes in codes.items()}
+
+        for var in self.dynamic_variables:
+            codes[var] = network.fuzzifier(var).codes(self._clip(var, reading[var]))[..., np.newaxis]
+
+        # Nodos intermedios dependientes de la lectura, en orden topológico; las raíces
+        # conservan sus códigos fuzzificados
+        for kernel in steps[:-1]:
+            if kernel.name not in codes:
+                codes[kernel.name] = kernel.best(codes)
+
+        target = steps[-1]
+        index = tuple(codes[parent] for parent in target.parents)
+        return target.tensor[index], self._target_crisp[index]
+
+    def scores(self, reading):
+        """Diccionario nombre -> riesgo crisp para una única lectura"""
+        _, crisp = self.evaluate(reading)
+        return dict(zip(self.names, crisp.tolist()))
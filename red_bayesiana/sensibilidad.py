@@ -0,0 +1,253 @@
+# Análisis de sensibilidad global (Morris y Sobol) sobre la inferencia por lotes
+from statistics import NormalDist
+
+import numpy as np
+
+from red_bayesiana.red import TrueFuzzyBayesianNetwork
+
+
+def input_bounds(network):
+    """Diccionario variable de entrada -> (mínimo, máximo) del universo de discurso"""
+    return {var: (float(network.fuzzy_systems[var]['universe'][0]),
+                  float(network.fuzzy_systems[var]['universe'][-1]))
+            for var in network.input_variables}
+
+
+class _BatchModel:
+    """Modelo vectorizado X (N, 8) -> riesgo crisp (N,), evaluado por bloques"""
+
+    def __init__(self, network=None, bounds=None, evaluate=None, chunk_size=200_000):
+        self.network = network if network is not None else TrueFuzzyBayesianNetwork.shared()
+        self.variables = self.network.input_variables
+        bounds = bounds or input_bounds(self.network)
+        missing = [var for var in self.variables if var not in bounds]
+        if missing:
+            raise ValueError(f"Faltan límites para: {missing}")
+        self.lows = np.array([bounds[var][0] for var in self.variables], dtype=np.float64)
+        self.widths = np.array([bounds[var][1] for var in self.variables], dtype=np.float64) - self.lows
+        self.evaluate = evaluate or (lambda evidence: self.network.fuzzy_inference_batch(evidence)[1])
+        self.chunk_size = chunk_size
+        self.n_evaluations = 0
+
+    def __call__(self, unit_design):
+        """Evaluar un diseño en el hipercubo unitario (..., 8)"""
+        unit_design = np.asarray(unit_design, dtype=np.float64)
+        flat = unit_design.reshape(-1, len(self.variables))
+        output = np.empty(len(flat))
+        for start in range(0, len(flat), self.chunk_size):
+            chunk = flat[start:start + self.chunk_size]
+            output[start:start + len(chunk)] = self.evaluate(self.lows + chunk * self.widths)
+        self.n_evaluations += len(flat)
+        return output.reshape(unit_design.shape[:-1])
+
+
+def _z_score(conf_level):
+    return NormalDist().inv_cdf(0.5 + conf_level / 2)
+
+
+def morris_indices(trajectories=100, levels=4, seed=None, network=None, bounds=None, evaluate=None,
+                   conf_level=0.95, n_bootstrap=1000):
+    """
+    Efectos elementales de Morris para todas las variables de entrada
+
+    Las `trajectories` trayectorias de k+1 puntos se generan de una vez sobre una
+    grilla de `levels` niveles (salto Δ = levels / (2 (levels - 1))) y se evalúan
+    con un único lote. Los efectos se expresan por unidad del rango normalizado de
+    cada variable, de modo que son comparables entre variables.
+
+    Args:
+        trajectories: Número de trayectorias r (r (k + 1) evaluaciones)
+        levels: Número de niveles de la grilla (par)
+        seed: Semilla del generador
+        network: Red a usar (por defecto, `TrueFuzzyBayesianNetwork.shared()`)
+        bounds: Diccionario variable -> (mínimo, máximo) (por defecto, el universo)
+        evaluate: Función opcional X (N, 8) -> riesgo (N,), p. ej. un evaluador paralelo
+        conf_level: Nivel de confianza del intervalo bootstrap de mu*
+
+    Returns:
+        Diccionario con 'variables', 'mu', 'mu_star', 'sigma', 'mu_star_conf' y 'n_evaluations'
+    """
+    if levels < 2 or levels % 2:
+        raise ValueError(f"levels debe ser par y al menos 2, recibido: {levels}")
+    model = _BatchModel(network, bounds, evaluate)
+    k = len(model.variables)
+    rng = np.random.default_rng(seed)
+    delta = levels / (2 * (levels - 1))
+
+    # Punto base en la grilla, dirección del salto y orden en que cambia cada variable
+    signs = rng.choice([-1.0, 1.0], size=(trajectories, k))
+    base_index = rng.integers(0, levels // 2, size=(trajectories, k)) + (signs < 0) * (levels // 2)
+    base = base_index / (levels - 1)
+    order = np.argsort(rng.random((trajectories, k)), axis=1)
+    rank = np.argsort(order, axis=1)
+
+    steps = np.arange(k + 1)
+    changed = rank[:, np.newaxis, :] < steps[np.newaxis, :, np.newaxis]
+    design = base[:, np.newaxis, :] + changed * (signs * delta)[:, np.newaxis, :]
+    output = model(design)
+
+    rows = np.arange(trajectories)[:, np.newaxis]
+    effects = (output[rows, rank + 1] - output[rows, rank]) / (signs * delta)
+
+    resampled = rng.integers(0, trajectories, size=(n_bootstrap, trajectories))
+    bootstrap_mu_star = np.abs(effects)[resampled].mean(axis=1)
+    return {
+        'variables': list(model.variables),
+        'mu': effects.mean(axis=0),
+        'mu_star': np.abs(effects).mean(axis=0),
+        'sigma': effects.std(axis=0, ddof=1) if trajectories > 1 else np.zeros(k),
+        'mu_star_conf': _z_score(conf_level) * bootstrap_mu_star.std(axis=0, ddof=1),
+        'n_evaluations': model.n_evaluations,
+    }
+
+
+def sobol_indices(n_samples=10_000, seed=None, network=None, bounds=None, evaluate=None,
+                  conf_level=0.95, n_bootstrap=100):
+    """
+    Índices de Sobol de primer orden y totales (esquema de Saltelli, N (k + 2) evaluaciones)
+
+    Se estiman con los estimadores de Saltelli (2010) para S1 y de Jansen para ST a
+    partir de dos matrices base A y B y de las k matrices A_B^(i), generadas y
+    evaluadas por lotes. Los intervalos se obtienen por bootstrap de las filas.
+
+    Args:
+        n_samples: Número de filas N de las matrices base
+        seed: Semilla del generador
+        network, bounds, evaluate: Como en `morris_indices`
+        conf_level: Nivel de confianza de los intervalos
+        n_bootstrap: Número de remuestreos bootstrap
+
+    Returns:
+        Diccionario con 'variables', 'S1', 'S1_conf', 'ST', 'ST_conf' y 'n_evaluations'
+    """
+    model = _BatchModel(network, bounds, evaluate)
+    k = len(model.variables)
+    rng = np.random.default_rng(seed)
+    a = rng.random((n_samples, k))
+    b = rng.random((n_samples, k))
+    f_a = model(a)
+    f_b = model(b)
+    f_ab = np.empty((n_samples, k))
+    for i in range(k):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        f_ab[:, i] = model(ab)
+
+    def estimate(f_a, f_b, f_ab):
+        variance = np.var(np.concatenate([f_a, f_b]), axis=0)
+        if variance == 0:
+            return np.zeros(k), np.zeros(k)
+        first = np.mean(f_b[:, np.newaxis] * (f_ab - f_a[:, np.newaxis]), axis=0) / variance
+        total = 0.5 * np.mean((f_a[:, np.newaxis] - f_ab) ** 2, axis=0) / variance
+        return first, total
+
+    first, total = estimate(f_a, f_b, f_ab)
+    bootstrap = np.empty((n_bootstrap, 2, k))
+    for draw in range(n_bootstrap):
+        rows = rng.integers(0, n_samples, size=n_samples)
+        bootstrap[draw] = estimate(f_a[rows], f_b[rows], f_ab[rows])
+    conf = _z_score(conf_level) * bootstrap.std(axis=0, ddof=1)
+    return {
+        'variables': list(model.variables),
+        'S1': first,
+        'S1_conf': conf[0],
+        'ST': total,
+        'ST_conf': conf[1],
+        'n_evaluations': model.n_evaluations,
+    }
+
+
+def variable_segments(network, variable, bounds=None):
+    """
+    Segmentos de estado constante de una variable de entrada dentro de sus límites
+
+    Se obtienen de los puntos de quiebre exactos de `network.fuzzifier(variable)`,
+    que ya incorporan los rangos de `fuzzy_systems[variable]` y las reglas de
+    desempate de `crisp_to_fuzzy_state`.
+
+    Returns:
+        Tupla (bordes, códigos): el segmento i es [bordes[i], bordes[i + 1]) (el último
+        incluye el límite superior) y tiene el estado `states[códigos[i]]` del nodo
+    """
+    universe = network.fuzzy_systems[variable]['universe']
+    low, high = bounds if bounds is not None else (float(universe[0]), float(universe[-1]))
+    partition = network.fuzzifier(variable)
+    starts, codes = partition.breakpoints, partition.segment_codes
+
+    first = np.searchsorted(starts, low, side='right') - 1
+    last = np.searchsorted(starts, high, side='right') - 1
+    codes = codes[first:last + 1]
+    if (codes < 0).any():
+        raise ValueError(f"La partición de '{variable}' tiene segmentos sin estado constante")
+    edges = np.concatenate([[low], starts[first + 1:last + 1], [high]]).astype(np.float64)
+    return edges, codes
+
+
+def _evaluate_rows(network, evidence, columns):
+    """Evaluar la evidencia base con las columnas indicadas reemplazadas por arreglos"""
+    variables = network.input_variables
+    missing = [var for var in variables if var not in evidence and var not in columns]
+    if missing:
+        raise ValueError(f"Falta evidencia base para: {missing}")
+    size = len(next(iter(columns.values())))
+    rows = np.empty((size, len(variables)))
+    for j, var in enumerate(variables):
+        rows[:, j] = columns[var] if var in columns else evidence[var]
+    return network.fuzzy_inference_batch(rows)[1]
+
+
+def step_function(variable, evidence, network=None, bounds=None):
+    """
+    Función escalonada exacta del riesgo frente a una variable de entrada
+
+    El riesgo es constante en cada segmento de estado, así que basta una evaluación
+    por segmento. La varianza y el rango se calculan exactamente suponiendo la
+    variable uniforme dentro de sus límites.
+
+    Args:
+        variable: Variable de entrada a analizar
+        evidence: Diccionario con los valores crisp del resto de variables
+        network: Red a usar (por defecto, `TrueFuzzyBayesianNetwork.shared()`)
+        bounds: Tupla (mínimo, máximo) (por defecto, el universo de la variable)
+
+    Returns:
+        Diccionario con 'variable', 'edges', 'states', 'risk' (uno por segmento),
+        'variance' y 'range'
+    """
+    network = network if network is not None else TrueFuzzyBayesianNetwork.shared()
+    edges, codes = variable_segments(network, variable, bounds)
+    risk = _evaluate_rows(network, evidence, {variable: edges[:-1]})
+
+    weights = np.diff(edges) / (edges[-1] - edges[0]) if edges[-1] > edges[0] else np.ones(1)
+    mean = np.sum(weights * risk)
+    states = network.nodes[variable].states
+    return {
+        'variable': variable,
+        'edges': edges,
+        'states': [states[code] for code in codes],
+        'risk': risk,
+        'variance': float(np.sum(weights * (risk - mean) ** 2)),
+        'range': float(risk.max() - risk.min()),
+    }
+
+
+def step_function_2d(variable_x, variable_y, evidence, network=None, bounds_x=None, bounds_y=None):
+    """
+    Partición exacta del riesgo frente a un par de variables de entrada
+
+    Returns:
+        Diccionario con 'variables', 'edges' y 'states' (uno por variable) y 'risk',
+        arreglo (segmentos de x, segmentos de y) con el riesgo de cada rectángulo
+    """
+    network = network if network is not None else TrueFuzzyBayesianNetwork.shared()
+    edges_x, codes_x = variable_segments(network, variable_x, bounds_x)
+    edges_y, codes_y = variable_segments(network, variable_y, bounds_y)
+    grid_x, grid_y = np.meshgrid(edges_x[:-1], edges_y[:-1], indexing='ij')
+    risk = _evaluate_rows(network, evidence, {variable_x: grid_x.ravel(), variable_y: grid_y.ravel()})
+    return {
+        'variables': (variable_x, variable_y),
+        'edges': (edges_x, edges_y),
+        'states': ([network.nodes[variable_x].states[code] for code in codes_x],
+                   [network.nodes[variable_y].states[code] for code in codes_y]),
+        'risk': risk.reshape(grid_x.shape),
+    }
@@ -0,0 +1,58 @@
+# Trazas estructuradas de inferencia en un búfer circular acotado
+import itertools
+import json
+import time
+from collections import deque
+
+
+class InferenceTrace:
+    """
+    Búfer circular de registros de `fuzzy_inference`, activado con `enable_tracing`
+
+    Cada registro es un diccionario serializable a JSON con la evidencia crisp (null
+    para las lecturas faltantes o no finitas), los estados fuzzificados y, por nodo inferido, la clave de regla usada, si era exacta
+    o interpolada, su similitud y el estado elegido. Al llenarse el búfer se descartan
+    los registros más antiguos.
+    """
+
+    def __init__(self, capacity=1024):
+        if capacity <= 0:
+            raise ValueError(f"capacity debe ser positivo, recibido: {capacity}")
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._sequence = itertools.count()
+
+    def append(self, record):
+        """Añadir un registro numerándolo y marcándolo con la hora"""
+        record['seq'] = next(self._sequence)
+        record['time'] = time.time()
+        self._records.append(record)
+
+    def records(self):
+        """Lista de los registros retenidos, del más antiguo al más reciente"""
+        return list(self._records)
+
+    def clear(self):
+        self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+    def export_jsonl(self, destination):
+        """
+        Escribir los registros en formato JSON Lines (un objeto por línea)
+
+        Args:
+            destination: Ruta del archivo o objeto con método `write`
+
+        Returns:
+            Número de registros escritos
+        """
+        records = self.records()
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        if hasattr(destination, 'write'):
+            destination.write(lines)
+        else:
+            with open(destination, 'w', encoding='utf-8') as output:
+                output.write(lines)
+        return len(records)
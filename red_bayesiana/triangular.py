@@ -2,6 +2,15 @@
 import numpy as np
 
 class TriangularFuzzyProbability:
+    """
+    Número difuso triangular inmutable (a, m, b)
+    
+    Usa __slots__ en lugar de un __dict__ por instancia, es hashable y comparable
+    por valor. Las constantes repetidas en CPDs y a prioris se comparten con `intern`.
+    """
+    __slots__ = ('a', 'm', 'b')
+    _interned = {}  # (a, m, b) -> instancia compartida
+    
     def __init__(self, a, m, b):
         """
         Número difuso triangular (a, m, b)
@@ -9,9 +18,35 @@ class TriangularFuzzyProbability:
         m: modal (más probable)
         b: límite superior
         """
-        self.a = a
-        self.m = m
-        self.b = b
+        _set_a(self, a)
+        _set_m(self, m)
+        _set_b(self, b)
+    
+    @classmethod
+    def intern(cls, a, m, b):
+        """Obtener la instancia compartida para (a, m, b), creándola si no existe"""
+        key = (a, m, b)
+        fuzzy_number = cls._interned.get(key)
+        if fuzzy_number is None:
+            fuzzy_number = cls._interned.setdefault(key, _make(a, m, b))
+        return fuzzy_number
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TriangularFuzzyProbability es inmutable (atributo '{name}')")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"TriangularFuzzyProbability es inmutable (atributo '{name}')")
+    
+    def __reduce__(self):
+        return (TriangularFuzzyProbability, (self.a, self.m, self.b))
+    
+    def __eq__(self, other):
+        if type(other) is not TriangularFuzzyProbability:
+            return NotImplemented
+        return self.a == other.a and self.m == other.m and self.b == other.b
+    
+    def __hash__(self):
+        return hash((self.a, self.m, self.b))
 
     def __repr__(self):
         return f"TFP({self.a:.3f}, {self.m:.3f}, {self.b:.3f})"
@@ -21,46 +56,42 @@ class TriangularFuzzyProbability:
 
     def __add__(self, other):
         """Suma de números difusos triangulares"""
-        if isinstance(other, TriangularFuzzyProbability):
-            return TriangularFuzzyProbability(
-                self.a + other.a,
-                self.m + other.m,
-                self.b + other.b
-            )
-        else:  # Suma con escalar
-            return TriangularFuzzyProbability(
-                self.a + other,
-                self.m + other,
-                self.b + other
-            )
+        if type(other) is TriangularFuzzyProbability:
+            return self.add_fuzzy(other)
+        if isinstance(other, TriangularFuzzyArray):
+            return NotImplemented
+        return self.add_scalar(other)  # Suma con escalar
 
     def __mul__(self, other):
         """Multiplicación de números difusos triangulares"""
-        if isinstance(other, TriangularFuzzyProbability):
-            # Multiplicación aproximada para números positivos
-            combinations = [
-                self.a * other.a, self.a * other.b,
-                self.b * other.a, self.b * other.b,
-                self.m * other.m
-            ]
-            return TriangularFuzzyProbability(
-                min(combinations),
-                self.m * other.m,
-                max(combinations)
-            )
-        else:  # Multiplicación con escalar
-            if other >= 0:
-                return TriangularFuzzyProbability(
-                    self.a * other,
-                    self.m * other,
-                    self.b * other
-                )
-            else:
-                return TriangularFuzzyProbability(
-                    self.b * other,
-                    self.m * other,
-                    self.a * other
-                )
+        if type(other) is TriangularFuzzyProbability:
+            return self.mul_fuzzy(other)
+        if isinstance(other, TriangularFuzzyArray):
+            return NotImplemented
+        return self.scale(other)  # Multiplicación con escalar
+    
+    # Operaciones sin despacho por tipo para cuando el tipo del operando es conocido
+    
+    def add_fuzzy(self, other):
+        """Suma con otro número difuso triangular"""
+        return _make(self.a + other.a, self.m + other.m, self.b + other.b)
+    
+    def add_scalar(self, other):
+        """Suma con un escalar"""
+        return _make(self.a + other, self.m + other, self.b + other)
+    
+    def mul_fuzzy(self, other):
+        """Multiplicación aproximada con otro número difuso triangular (números positivos)"""
+        modal = self.m * other.m
+        aa, ab = self.a * other.a, self.a * other.b
+        ba, bb = self.b * other.a, self.b * other.b
+        return _make(min(aa, ab, ba, bb, modal), modal, max(aa, ab, ba, bb, modal))
+    
+    def scale(self, other):
+        """Multiplicación con un escalar (los extremos se intercambian si es negativo)"""
+        if other >= 0:
+            return _make(self.a * other, self.m * other, self.b * other)
+        return _make(self.b * other, self.m * other, self.a * other)
 
     def __truediv__(self, other):
         """División de números difusos triangulares"""
@@ -76,13 +107,9 @@ class TriangularFuzzyProbability:
     def normalize(self):
         """Normaliza el número difuso para que el modal sea máximo 1"""
         if self.m == 0:
-            return TriangularFuzzyProbability(0, 0, 0)
+            return TriangularFuzzyProbability.intern(0, 0, 0)
         factor = 1.0 / self.m
-        return TriangularFuzzyProbability(
-            self.a * factor,
-            1.0,
-            self.b * factor
-        )
+        return _make(self.a * factor, 1.0, self.b * factor)
 
     def membership(self, x):
         """Calcula el grado de membresía para un valor x"""
@@ -133,3 +160,331 @@ class TriangularFuzzyProbability:
         else:
             # Valor por defecto
             return TriangularFuzzyProbability(low + span*0.3, low + span*0.5, low + span*0.7)
+
+
+# Constructor rápido: asigna los slots directamente sin pasar por __init__ ni __setattr__
+_set_a = TriangularFuzzyProbability.a.__set__
+_set_m = TriangularFuzzyProbability.m.__set__
+_set_b = TriangularFuzzyProbability.b.__set__
+_new = object.__new__
+
+
+def _make(a, m, b):
+    fuzzy_number = _new(TriangularFuzzyProbability)
+    _set_a(fuzzy_number, a)
+    _set_m(fuzzy_number, m)
+    _set_b(fuzzy_number, b)
+    return fuzzy_number
+
+
+class TriangularFuzzyArray:
+    """
+    Arreglo de números difusos triangulares almacenado como estructura de arreglos
+    
+    Guarda a, m y b en arreglos NumPy contiguos de la misma forma y aplica las mismas
+    reglas que `TriangularFuzzyProbability` elemento a elemento, con broadcasting.
+    """
+    
+    def __init__(self, a, m, b):
+        a, m, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64),
+                                      np.asarray(m, dtype=np.float64),
+                                      np.asarray(b, dtype=np.float64))
+        self.a = np.ascontiguousarray(a)
+        self.m = np.ascontiguousarray(m)
+        self.b = np.ascontiguousarray(b)
+    
+    @classmethod
+    def from_scalars(cls, fuzzy_numbers):
+        """Construir el arreglo a partir de una secuencia de TriangularFuzzyProbability"""
+        values = np.array([(f.a, f.m, f.b) for f in fuzzy_numbers], dtype=np.float64).reshape(-1, 3)
+        return cls.from_stacked(values)
+    
+    @classmethod
+    def from_stacked(cls, values):
+        """Construir el arreglo a partir de un arreglo (..., 3) con (a, m, b) en el último eje"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape[-1:] != (3,):
+            raise ValueError(f"Se esperaba un arreglo (..., 3), recibido: {values.shape}")
+        return cls(values[..., 0], values[..., 1], values[..., 2])
+    
+    def to_scalars(self):
+        """Convertir a una lista plana de TriangularFuzzyProbability"""
+        return [TriangularFuzzyProbability(a, m, b)
+                for a, m, b in zip(self.a.ravel().tolist(), self.m.ravel().tolist(), self.b.ravel().tolist())]
+    
+    def stack(self):
+        """Arreglo (..., 3) con (a, m, b) en el último eje"""
+        return np.stack([self.a, self.m, self.b], axis=-1)
+    
+    @property
+    def shape(self):
+        return self.a.shape
+    
+    def __len__(self):
+        return len(self.a)
+    
+    def __getitem__(self, index):
+        a, m, b = self.a[index], self.m[index], self.b[index]
+        if np.ndim(a) == 0:
+            return TriangularFuzzyProbability(float(a), float(m), float(b))
+        return TriangularFuzzyArray(a, m, b)
+    
+    def __repr__(self):
+        return f"TFA(shape={self.shape})"
+    
+    @staticmethod
+    def _as_fuzzy(other):
+        """Convertir el otro operando en TriangularFuzzyArray si es difuso, o None si es escalar"""
+        if isinstance(other, TriangularFuzzyArray):
+            return other
+        if isinstance(other, TriangularFuzzyProbability):
+            return TriangularFuzzyArray(other.a, other.m, other.b)
+        return None
+    
+    def __add__(self, other):
+        """Suma de números difusos triangulares (o con escalares) elemento a elemento"""
+        fuzzy = self._as_fuzzy(other)
+        if fuzzy is not None:
+            return TriangularFuzzyArray(self.a + fuzzy.a, self.m + fuzzy.m, self.b + fuzzy.b)
+        return TriangularFuzzyArray(self.a + other, self.m + other, self.b + other)
+    
+    __radd__ = __add__
+    
+    def __mul__(self, other):
+        """Multiplicación de números difusos triangulares (o con escalares) elemento a elemento"""
+        fuzzy = self._as_fuzzy(other)
+        if fuzzy is not None:
+            # Multiplicación aproximada, igual que en la versión escalar
+            modal = self.m * fuzzy.m
+            combinations = (self.a * fuzzy.a, self.a * fuzzy.b,
+                            self.b * fuzzy.a, self.b * fuzzy.b, modal)
+            return TriangularFuzzyArray(np.minimum.reduce(combinations), modal,
+                                        np.maximum.reduce(combinations))
+        
+        # Multiplicación con escalar: los extremos se intercambian si es negativo
+        other = np.asarray(other, dtype=np.float64)
+        low, high = self.a * other, self.b * other
+        positive = other >= 0
+        return TriangularFuzzyArray(np.where(positive, low, high), self.m * other,
+                                    np.where(positive, high, low))
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        """División por escalares"""
+        if self._as_fuzzy(other) is not None:
+            raise NotImplementedError("División entre números difusos no implementada")
+        return self * (1 / np.asarray(other, dtype=np.float64))
+    
+    def centroid(self):
+        """Centroide de cada número difuso"""
+        return (self.a + self.m + self.b) / 3
+    
+    def defuzzify_centroid(self):
+        """Defuzzificación por método del centroide"""
+        return self.centroid()
+    
+    def normalize(self):
+        """Normaliza cada número difuso para que el modal sea 1 (o (0, 0, 0) si el modal es 0)"""
+        zero = self.m == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = 1.0 / self.m
+        return TriangularFuzzyArray(np.where(zero, 0.0, self.a * factor),
+                                    np.where(zero, 0.0, 1.0),
+                                    np.where(zero, 0.0, self.b * factor))
+    
+    def membership(self, x):
+        """Grado de membresía de x en cada número difuso (con broadcasting)"""
+        x = np.asarray(x, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rising = (x - self.a) / (self.m - self.a)
+            falling = (self.b - x) / (self.b - self.m)
+        return np.select([(x <= self.a) | (x >= self.b), x == self.m, x < self.m],
+                         [0.0, 1.0, rising], falling)
+    
+    def alpha_cut(self, alpha):
+        """Corte alfa de cada número difuso; devuelve los arreglos (izquierda, derecha)"""
+        alpha = np.asarray(alpha, dtype=np.float64)
+        left = self.a + alpha * (self.m - self.a)
+        right = self.b - alpha * (self.b - self.m)
+        left = np.where(alpha == 0, self.a, np.where(alpha == 1, self.m, left))
+        right = np.where(alpha == 0, self.b, np.where(alpha == 1, self.m, right))
+        return left, right
+
+
+class AlphaCutArray:
+    """
+    Arreglo de números difusos representados por K cortes alfa
+    
+    Cada número difuso se guarda como un arreglo (K, 2) de intervalos [izquierda, derecha],
+    uno por nivel de `alphas` (de 0 a 1), de modo que el arreglo completo tiene forma
+    (..., K, 2). La aritmética aplica las reglas de intervalos a todos los niveles a la
+    vez, lo que sigue el principio de extensión exactamente en esos niveles (por
+    ejemplo, el producto de dos triángulos no se aproxima por otro triángulo).
+    """
+    
+    def __init__(self, intervals, alphas):
+        self.intervals = np.asarray(intervals, dtype=np.float64)
+        self.alphas = np.asarray(alphas, dtype=np.float64)
+        if self.alphas.ndim != 1 or self.alphas[0] != 0 or self.alphas[-1] != 1:
+            raise ValueError("Los niveles alfa deben ir de 0 a 1")
+        if self.intervals.shape[-2:] != (len(self.alphas), 2):
+            raise ValueError(f"Se esperaba un arreglo (..., {len(self.alphas)}, 2), "
+                             f"recibido: {self.intervals.shape}")
+    
+    @staticmethod
+    def levels(count):
+        """Niveles alfa equiespaciados entre 0 y 1"""
+        if count < 2:
+            raise ValueError(f"Se necesitan al menos 2 niveles alfa, recibido: {count}")
+        return np.linspace(0.0, 1.0, count)
+    
+    @classmethod
+    def from_triangular(cls, fuzzy, levels=21):
+        """
+        Cortes alfa de números difusos triangulares
+        
+        Args:
+            fuzzy: TriangularFuzzyProbability, TriangularFuzzyArray o arreglo (..., 3)
+            levels: Número de niveles o arreglo de niveles alfa (de 0 a 1)
+        """
+        if isinstance(fuzzy, TriangularFuzzyProbability):
+            fuzzy = TriangularFuzzyArray(fuzzy.a, fuzzy.m, fuzzy.b)
+        elif not isinstance(fuzzy, TriangularFuzzyArray):
+            fuzzy = TriangularFuzzyArray.from_stacked(fuzzy)
+        alphas = cls.levels(levels) if np.ndim(levels) == 0 else np.asarray(levels, dtype=np.float64)
+        expanded = TriangularFuzzyArray(fuzzy.a[..., np.newaxis], fuzzy.m[..., np.newaxis],
+                                        fuzzy.b[..., np.newaxis])
+        left, right = expanded.alpha_cut(alphas)
+        return cls(np.stack([left, right], axis=-1), alphas)
+    
+    @property
+    def shape(self):
+        return self.intervals.shape[:-2]
+    
+    @property
+    def lower(self):
+        return self.intervals[..., 0]
+    
+    @property
+    def upper(self):
+        return self.intervals[..., 1]
+    
+    def __len__(self):
+        return len(self.intervals)
+    
+    def __getitem__(self, index):
+        index = index if isinstance(index, tuple) else (index,)
+        return AlphaCutArray(self.intervals[index + (Ellipsis,)], self.alphas)
+    
+    def __repr__(self):
+        return f"AlphaCutArray(shape={self.shape}, niveles={len(self.alphas)})"
+    
+    def _as_cuts(self, other):
+        """Convertir el otro operando en AlphaCutArray con los mismos niveles, o None si es escalar"""
+        if isinstance(other, AlphaCutArray):
+            if not np.array_equal(other.alphas, self.alphas):
+                raise ValueError("Los operandos tienen niveles alfa distintos")
+            return other
+        if isinstance(other, (TriangularFuzzyProbability, TriangularFuzzyArray)):
+            return AlphaCutArray.from_triangular(other, self.alphas)
+        return None
+    
+    @staticmethod
+    def _scalar(other):
+        """Escalar o arreglo de escalares con ejes para los niveles y los extremos"""
+        return np.asarray(other, dtype=np.float64)[..., np.newaxis, np.newaxis]
+    
+    def __add__(self, other):
+        """Suma de intervalos en todos los niveles: [l1 + l2, r1 + r2]"""
+        cuts = self._as_cuts(other)
+        if cuts is not None:
+            return AlphaCutArray(self.intervals + cuts.intervals, self.alphas)
+        return AlphaCutArray(self.intervals + self._scalar(other), self.alphas)
+    
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        """Resta de intervalos en todos los niveles: [l1 - r2, r1 - l2]"""
+        cuts = self._as_cuts(other)
+        if cuts is not None:
+            return AlphaCutArray(self.intervals - cuts.intervals[..., ::-1], self.alphas)
+        return AlphaCutArray(self.intervals - self._scalar(other), self.alphas)
+    
+    def __mul__(self, other):
+        """Producto de intervalos en todos los niveles (mínimo y máximo de los cuatro productos)"""
+        cuts = self._as_cuts(other)
+        if cuts is None:
+            return AlphaCutArray(np.sort(self.intervals * self._scalar(other), axis=-1), self.alphas)
+        products = np.stack([self.lower * cuts.lower, self.lower * cuts.upper,
+                             self.upper * cuts.lower, self.upper * cuts.upper], axis=-1)
+        return AlphaCutArray(np.stack([products.min(axis=-1), products.max(axis=-1)], axis=-1), self.alphas)
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        """División por escalares o por números difusos cuyos cortes no contienen el 0"""
+        cuts = self._as_cuts(other)
+        if cuts is None:
+            return self * (1 / np.asarray(other, dtype=np.float64))
+        if np.any((cuts.lower <= 0) & (cuts.upper >= 0)):
+            raise ZeroDivisionError("El divisor difuso contiene el 0 en algún corte alfa")
+        return self * AlphaCutArray(1 / cuts.intervals[..., ::-1], self.alphas)
+    
+    def sum(self, axis=0):
+        """Suma difusa a lo largo de un eje de la forma del arreglo"""
+        axis = axis if axis >= 0 else axis + len(self.shape)
+        return AlphaCutArray(self.intervals.sum(axis=axis), self.alphas)
+    
+    def weighted_average(self, values):
+        """
+        Media ponderada difusa sum(v_s * w_s) / sum(w_s) con pesos difusos no negativos
+        
+        Los pesos son los números difusos del último eje de la forma y `values` los valores
+        crisp de cada posición. En cada nivel alfa el rango exacto se alcanza en uno de
+        los S + 1 vértices que asignan el extremo superior a los valores menores y el
+        inferior al resto (o al revés), así que no hay sobreestimación por dependencia.
+        Si la suma de pesos es 0 el resultado es 5.0, como en `defuzzify_distribution`.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        lower = np.moveaxis(self.lower[..., order, :], -2, -1)[..., np.newaxis, :]
+        upper = np.moveaxis(self.upper[..., order, :], -2, -1)[..., np.newaxis, :]
+        
+        # Vértice j: las j primeras posiciones (valores menores) con un extremo y el resto con el otro
+        count = len(values)
+        first = np.arange(count)[np.newaxis, :] < np.arange(count + 1)[:, np.newaxis]
+        candidates = []
+        for low_first_weights, high_rest_weights in ((upper, lower), (lower, upper)):
+            weights = np.where(first, low_first_weights, high_rest_weights)
+            total = weights.sum(axis=-1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                candidates.append(np.where(total > 0, (weights * values).sum(axis=-1) / total, 5.0))
+        low, high = candidates[0].min(axis=-1), candidates[1].max(axis=-1)
+        return AlphaCutArray(np.stack([low, high], axis=-1), self.alphas)
+    
+    def to_triangular(self):
+        """Triángulo con el soporte del corte 0 y el modal en el centro del corte 1"""
+        return TriangularFuzzyArray(self.lower[..., 0],
+                                    (self.lower[..., -1] + self.upper[..., -1]) / 2,
+                                    self.upper[..., 0])
+    
+    def centroid(self):
+        """
+        Centroide de cada número difuso, con membresía lineal entre niveles consecutivos
+        
+        Es exacto para triángulos: coincide con (a + m + b) / 3 con cualquier número de niveles.
+        """
+        steps = np.diff(self.alphas)
+        left0, left1 = self.lower[..., :-1], self.lower[..., 1:]
+        right0, right1 = self.upper[..., :-1], self.upper[..., 1:]
+        area = np.sum(steps * ((right0 + right1) - (left0 + left1)) / 2, axis=-1)
+        moment = np.sum(steps * ((right0 ** 2 + right0 * right1 + right1 ** 2)
+                                 - (left0 ** 2 + left0 * left1 + left1 ** 2)) / 6, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(area > 0, moment / area, self.lower[..., 0])
+    
+    def defuzzify_centroid(self):
+        """Defuzzificación por método del centroide"""
+        return self.centroid()